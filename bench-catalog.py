@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the catalog build in generate-catalog.py"""
+
+import argparse
+import importlib.util
+import json
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+
+
+def load_generator():
+    """Import generate-catalog.py, which cannot be imported by name."""
+    spec = importlib.util.spec_from_file_location('generate_catalog', ROOT / 'generate-catalog.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_parse_frontmatter(text):
+    """parse_frontmatter() as it was before the streaming rewrite, kept as the reference."""
+    m = re.match(r'^---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|$)', text, re.S)
+    if not m:
+        return {}
+
+    fields = {}
+    key = None
+    buf = []
+    folded = False
+
+    def flush():
+        if key is None:
+            return
+        joined = ' '.join(p.strip() for p in buf if p.strip()) if folded else '\n'.join(buf)
+        fields[key] = joined.strip()
+
+    for line in m.group(1).split('\n'):
+        line = line.rstrip('\r')
+        head = re.match(r'^([A-Za-z_][A-Za-z0-9_-]*):[ \t]*(.*)$', line)
+        if head and not line.startswith((' ', '\t')):
+            flush()
+            key, rest = head.group(1), head.group(2).strip()
+            if rest in ('|', '|-', '|+', '>', '>-', '>+'):
+                buf, folded = [], rest.startswith('>')
+            else:
+                if len(rest) >= 2 and rest[0] == rest[-1] and rest[0] in '"\'':
+                    rest = rest[1:-1]
+                buf, folded = ([rest] if rest else []), True
+        elif key is not None and (line.startswith((' ', '\t')) or not line.strip()):
+            buf.append(line.strip() if folded else line.lstrip())
+    flush()
+    return fields
+
+
+def synthetic_skills():
+    """Yield (label, SKILL.md text) pairs covering the shapes worth timing."""
+    yield 'tiny', '---\nname: tiny\ndescription: A tiny skill.\n---\n\n# Tiny\n'
+
+    body = ''.join(f'Paragraph {i} of a very long skill body with `code` and prose.\n\n' for i in range(50000))
+    yield 'huge-body', '---\nname: huge\ndescription: "Quoted description"\n---\n\n# Huge\n\n' + body
+
+    block = ''.join(f'  line {i} of a deep literal block scalar\n' for i in range(5000))
+    yield 'deep-block', '---\nname: deep\ndescription: |\n' + block + 'license: MIT\n---\n\n# Deep\n'
+
+    folded = ''.join(f'    folded line {i}\n\n' for i in range(5000))
+    yield 'deep-folded', '---\nname: folded\ndescription: >-\n' + folded + '---\n# Folded\n'
+
+
+def edge_cases():
+    """Inputs where the exact regex semantics of the legacy parser matter."""
+    yield '---\n---\n'
+    yield '---\n---\nname: x\n---\n'
+    yield '---\r\nname: crlf\r\ndescription: >\r\n  a\r\n  b\r\n---\r\nbody'
+    yield '---  \nname: trailing\n---\t\n'
+    yield '---\nname: eof\n---'
+    yield '---\nname: eof-cr\n---\r'
+    yield '---\nname: unclosed\n'
+    yield '# No frontmatter\n---\nname: x\n---\n'
+    yield '---\nname: x\n---x\ndescription: y\n---\n'
+    yield "---\nname: 'single'\ndescription: \"\n- list\n  continued\n# comment\n---\n"
+    yield ''
+
+
+def random_frontmatter(rng):
+    keys = ['name', 'description', 'license', 'allowed-tools', 'metadata', '_x']
+    values = ['plain', '"quoted"', "'single'", '|', '|-', '>', '>+', '', '"', 'a: b', '---']
+    lines = ['---']
+    for _ in range(rng.randint(0, 8)):
+        lines.append(f'{rng.choice(keys)}: {rng.choice(values)}')
+        for _ in range(rng.randint(0, 3)):
+            lines.append(rng.choice(['  indented text', '\tTabbed', '', '   ', 'stray line', '  - item']))
+    lines.append(rng.choice(['---', '--- ', '---x']))
+    lines.append(rng.choice(['', 'body', '---', 'key: after']))
+    return rng.choice(['\n', '\r\n']).join(lines)
+
+
+def check_equivalence(gen, texts):
+    """Return the inputs where the new parser disagrees with the legacy one."""
+    mismatches = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'SKILL.md'
+        for text in texts:
+            expected = legacy_parse_frontmatter(text)
+            if gen.parse_frontmatter(text) != expected:
+                mismatches.append(text)
+                continue
+            # read_frontmatter() sees the file through universal newlines,
+            # exactly like the old open().read() did.
+            path.write_text(text, encoding='utf-8', newline='')
+            if gen.read_frontmatter(path) != legacy_parse_frontmatter(path.read_text(encoding='utf-8')):
+                mismatches.append(text)
+    return mismatches
+
+
+def bench_frontmatter(args):
+    gen = load_generator()
+    rng = random.Random(args.seed)
+
+    cases = list(synthetic_skills())
+    texts = [text for _, text in cases] + list(edge_cases())
+    texts += [random_frontmatter(rng) for _ in range(args.fuzz)]
+    texts += [p.read_text(encoding='utf-8') for p in sorted((ROOT / 'skills').glob('*/SKILL.md'))]
+    mismatches = check_equivalence(gen, texts)
+    print(f"Equivalence: {len(texts) - len(mismatches)}/{len(texts)} inputs match the legacy parser")
+    for text in mismatches[:5]:
+        print(f"  MISMATCH: {text[:80]!r}")
+
+    def legacy(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return legacy_parse_frontmatter(f.read())
+
+    print(f"\n{'case':<14}{'size':>12}{'legacy':>12}{'streaming':>12}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, text in cases:
+            path = Path(tmp) / f'{label}.md'
+            path.write_text(text, encoding='utf-8')
+            old = min(timeit.repeat(lambda: legacy(path), number=args.number, repeat=args.repeat))
+            new = min(timeit.repeat(lambda: gen.read_frontmatter(path), number=args.number, repeat=args.repeat))
+            print(f"{label:<14}{len(text):>12,}{old / args.number * 1e6:>10.1f}us"
+                  f"{new / args.number * 1e6:>10.1f}us{old / new:>9.1f}x")
+
+    real = sorted((ROOT / 'skills').glob('*/SKILL.md'))
+    old = min(timeit.repeat(lambda: [legacy(p) for p in real], number=1, repeat=args.repeat))
+    new = min(timeit.repeat(lambda: [gen.read_frontmatter(p) for p in real], number=1, repeat=args.repeat))
+    print(f"{'skills/ (' + str(len(real)) + ')':<14}{'':>12}{old * 1e3:>10.1f}ms{new * 1e3:>10.1f}ms{old / new:>9.1f}x")
+
+    return 1 if mismatches else 0
+
+
+def synthetic_catalog(count, rng):
+    categories = ['AI/ML', 'Automation', 'Cloudflare', 'DevOps', 'Development Tools',
+                  'General', 'Scientific', 'Web Development']
+    words = 'skill agent build deploy test data cloud api worker query render parse cache index'.split()
+    return [
+        {
+            'name': f'skill-{i:06d}-{rng.choice(words)}',
+            'description': ' '.join(rng.choice(words) for _ in range(rng.randint(10, 30)))[:200],
+            'category': rng.choice(categories),
+        }
+        for i in range(count)
+    ]
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes."""
+    # ru_maxrss survives exec on Linux, so a child spawned by a big parent
+    # would report the parent's peak. VmHWM is reset on exec.
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux but bytes on macOS.
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def measure_load(fmt, path, name):
+    """Load a catalog and look one skill up; run in a child so RSS is isolated."""
+    gen = load_generator()
+    before = peak_rss()
+    started = time.perf_counter()
+    if fmt == 'json':
+        with open(path, 'r', encoding='utf-8') as f:
+            skills = json.load(f)['skills']
+        found = next(skill for skill in skills if skill['name'] == name)
+    else:
+        catalog = gen.CompactCatalog(path)
+        found = catalog.get(name)
+    elapsed = time.perf_counter() - started
+    assert found['name'] == name
+    print(json.dumps({'seconds': elapsed, 'rss': peak_rss() - before}))
+    return 0
+
+
+def bench_compact(args):
+    gen = load_generator()
+    skills = synthetic_catalog(args.skills, random.Random(args.seed))
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / 'skills-catalog.json'
+        gen.write_catalog(skills, tmp, compact=True)
+        bin_path = Path(tmp) / 'skills-catalog.bin'
+
+        with gen.CompactCatalog(bin_path) as catalog:
+            if list(catalog) != sorted(skills, key=lambda skill: skill['name']):
+                print("MISMATCH: compact catalog does not round-trip")
+                return 1
+
+        name = skills[len(skills) // 2]['name']
+        print(f"{args.skills:,} synthetic skills, best of {args.repeat} cold loads + one lookup")
+        print(f"\n{'format':<10}{'file size':>14}{'load':>12}{'RSS growth':>14}")
+        for fmt, path in (('json', json_path), ('compact', bin_path)):
+            runs = []
+            for _ in range(args.repeat):
+                out = subprocess.run([sys.executable, __file__, '_load', fmt, str(path), name],
+                                     check=True, capture_output=True, text=True).stdout
+                runs.append(json.loads(out))
+            seconds = min(run['seconds'] for run in runs)
+            rss = min(run['rss'] for run in runs)
+            print(f"{fmt:<10}{path.stat().st_size:>14,}{seconds * 1e3:>10.2f}ms{rss / 2**20:>11.1f}MiB")
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the catalog build')
+    sub = parser.add_subparsers(dest='bench', required=True)
+
+    fm = sub.add_parser('frontmatter', help='streaming frontmatter parser vs the legacy regex parser')
+    fm.add_argument('--number', type=int, default=20, help='calls per timing sample')
+    fm.add_argument('--repeat', type=int, default=5, help='timing samples per case (best is reported)')
+    fm.add_argument('--fuzz', type=int, default=2000, help='random frontmatter blocks to check for equivalence')
+    fm.add_argument('--seed', type=int, default=0)
+    fm.set_defaults(func=bench_frontmatter)
+
+    compact = sub.add_parser('compact', help='skills-catalog.bin vs skills-catalog.json load time and RSS')
+    compact.add_argument('--skills', type=int, default=100000, help='synthetic catalog size')
+    compact.add_argument('--repeat', type=int, default=3, help='cold loads per format (best is reported)')
+    compact.add_argument('--seed', type=int, default=0)
+    compact.set_defaults(func=bench_compact)
+
+    # Internal: one isolated load, spawned by the compact benchmark.
+    load = sub.add_parser('_load')
+    load.add_argument('fmt', choices=['json', 'compact'])
+    load.add_argument('path')
+    load.add_argument('name')
+    load.set_defaults(func=lambda args: measure_load(args.fmt, args.path, args.name))
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
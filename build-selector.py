@@ -1,16 +1,169 @@
 #!/usr/bin/env python3
 """Build the enhanced skill selector with embedded data"""
 
+import argparse
+import contextlib
+import gzip
+import hashlib
 import json
+import re
+import time
 from pathlib import Path
 
-# Read catalog
-with open('docs/skills-catalog.json', 'r', encoding='utf-8') as f:
-    catalog = json.load(f)
+try:
+    import brotli
+except ImportError:  # optional: without it, --production only writes .gz
+    brotli = None
 
-skills_js = json.dumps(catalog['skills'], ensure_ascii=False)
+DOCS_DIR = Path(__file__).parent / 'docs'
 
-html = f'''<!DOCTYPE html>
+# Must agree with tokenize() in docs/selector.js.
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+@contextlib.contextmanager
+def _timed(profile, phase):
+    """Add the time spent in the block to profile[phase], if profiling."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if profile is not None:
+            profile[phase] = profile.get(phase, 0.0) + time.perf_counter() - started
+
+
+def build_search_index(skills):
+    """Build the inverted index selector.js searches instead of scanning every skill.
+
+    tokens is every distinct word of the skills' names, descriptions and
+    categories, sorted; postings[i] lists the positions of the skills that
+    contain tokens[i], delta-encoded: the first position, then the gap to
+    each next one. selector.js sorts the suffixes of these tokens once on
+    load, so a query word is a binary search for the suffixes it prefixes.
+    The suffix list itself is not shipped: it is several times the size of
+    the tokens it comes from.
+    """
+    postings = {}
+    for i, skill in enumerate(skills):
+        text = ' '.join((skill['name'], skill['description'], skill.get('category', ''))).lower()
+        for token in set(TOKEN_RE.findall(text)):
+            postings.setdefault(token, []).append(i)
+
+    tokens = sorted(postings)
+    return {
+        'tokens': tokens,
+        'postings': [[ids[0]] + [b - a for a, b in zip(ids, ids[1:])] for ids in map(postings.get, tokens)],
+    }
+
+
+def _write_hashed(directory, stem, data):
+    """Write data as JSON to stem.<hash>.json and describe it for the manifest.
+
+    The content hash is in the file name, so the files can be served with
+    a far-future cache lifetime: a changed shard always gets a new URL.
+    """
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    digest = hashlib.sha256(payload).hexdigest()
+    name = f'{stem}.{digest[:12]}.json'
+    (directory / name).write_bytes(payload)
+    return {'file': f'{directory.name}/{name}', 'bytes': len(payload), 'sha256': digest}
+
+
+def build_shards(skills, shard_size, docs_dir=DOCS_DIR):
+    """Split the catalog into a small inline manifest and lazily fetched shards.
+
+    The manifest keeps what the first paint needs: every skill's name and
+    category (as an index into categories) and per-category counts. The
+    descriptions go into fixed-size shards of shard_size skills, and the
+    search index into a file of its own. Shards from earlier builds that
+    are no longer referenced are deleted.
+    """
+    shard_dir = Path(docs_dir) / 'shards'
+    shard_dir.mkdir(exist_ok=True)
+
+    categories = sorted({skill.get('category', 'General') for skill in skills})
+    category_ids = {category: i for i, category in enumerate(categories)}
+    counts = {category: 0 for category in categories}
+    for skill in skills:
+        counts[skill.get('category', 'General')] += 1
+
+    shards = []
+    for start in range(0, len(skills), shard_size):
+        chunk = skills[start:start + shard_size]
+        shard = _write_hashed(shard_dir, f'skills-{len(shards):03d}', [skill['description'] for skill in chunk])
+        shard.update(start=start, count=len(chunk))
+        shards.append(shard)
+    search_index = _write_hashed(shard_dir, 'search-index', build_search_index(skills))
+
+    # Match by the .json name so --production's .gz/.br siblings of replaced
+    # shards go too.
+    live = {Path(entry['file']).name for entry in shards + [search_index]}
+    for stale in shard_dir.glob('*.json*'):
+        if stale.name.partition('.json')[0] + '.json' not in live:
+            stale.unlink()
+
+    return {
+        'categories': categories,
+        'counts': counts,
+        'skills': [[skill['name'], category_ids[skill.get('category', 'General')]] for skill in skills],
+        'shards': shards,
+        'searchIndex': search_index,
+    }
+
+
+# Quoted strings are matched first and kept verbatim, so only whitespace and
+# comments outside them are touched.
+_CSS_TOKEN_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/|\s+', re.S)
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+# A space before ':' can be a descendant combinator (`a :hover` is not
+# `a:hover`), so only the space after it goes.
+_CSS_COLON_RE = re.compile(r':\s+')
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet.
+
+    >>> minify_css('a :hover { color : red; }  /* note */')
+    'a :hover{color :red}'
+    >>> minify_css('p > a:hover, b { content: " : " }')
+    'p>a:hover,b{content:" : "}'
+    """
+    def squeeze(m):
+        if m.group(1):
+            return m.group(1)
+        return '' if m.group(0).startswith('/*') else ' '
+
+    parts = _CSS_TOKEN_RE.sub(squeeze, css)
+    # Split out the strings again so punctuation inside them is left alone.
+    pieces = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', parts)
+    for i in range(0, len(pieces), 2):
+        pieces[i] = _CSS_COLON_RE.sub(':', _CSS_PUNCT_RE.sub(r'\1', pieces[i]))
+    return ''.join(pieces).replace(';}', '}').strip()
+
+
+def render_index(skills, manifest=None, minify=False, profile=None):
+    """Return the selector page with the given catalog entries embedded.
+
+    With a manifest from build_shards(), only the manifest is embedded and
+    selector.js fetches descriptions and the search index after first paint.
+    minify compacts the inline CSS and JSON for production. profile, a
+    dict, collects seconds per phase.
+    """
+    if manifest is None:
+        with _timed(profile, 'search_index'):
+            search_index = build_search_index(skills)
+        with _timed(profile, 'serialization'):
+            skills_js = json.dumps(skills, ensure_ascii=False, separators=(',', ':') if minify else None)
+            index_js = json.dumps(search_index, ensure_ascii=False, separators=(',', ':'))
+        data_js = f'''window.EMBEDDED_SKILLS = {skills_js};
+        window.SKILLS_INDEX = {index_js};'''
+    else:
+        with _timed(profile, 'serialization'):
+            manifest_js = json.dumps(manifest, ensure_ascii=False, separators=(',', ':'))
+        data_js = f'window.SKILLS_MANIFEST = {manifest_js};'
+
+    started = time.perf_counter()
+    html = f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -350,7 +503,7 @@ html = f'''<!DOCTYPE html>
     </div>
     <script src="selector.js"></script>
     <script>
-        window.EMBEDDED_SKILLS = {skills_js};
+        {data_js}
         window.addEventListener('DOMContentLoaded', () => {{
             initializeSkills();
         }});
@@ -358,18 +511,114 @@ html = f'''<!DOCTYPE html>
 </body>
 </html>
 '''
+    if profile is not None:
+        profile['render'] = profile.get('render', 0.0) + time.perf_counter() - started
+    if minify:
+        with _timed(profile, 'minify'):
+            html = re.sub(r'(<style>)(.*?)(</style>)',
+                          lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), html, flags=re.S)
+    return html
+
+
+def build_selector(skills, docs_dir=DOCS_DIR, shard_size=None, minify=False, profile=None):
+    """Write docs/index.html for the given catalog entries and return its path.
+
+    shard_size switches to the sharded layout described in build_shards().
+    """
+    with _timed(profile, 'shards'):
+        manifest = build_shards(skills, shard_size, docs_dir) if shard_size else None
+    html = render_index(skills, manifest, minify, profile)
+    out = Path(docs_dir) / 'index.html'
+    with _timed(profile, 'write'), open(out, 'w', encoding='utf-8') as f:
+        f.write(html)
+    # Precompressed copies from an earlier --production build would be served
+    # in place of the new page (and of a selector.js edited since); a
+    # production build writes fresh ones right after this.
+    for asset in (out, Path(docs_dir) / 'selector.js'):
+        remove_compressed(asset)
+    return out
+
+
+def remove_compressed(path):
+    """Delete the .gz/.br siblings write_compressed() made of path, if any."""
+    for suffix in ('.gz', '.br'):
+        Path(str(path) + suffix).unlink(missing_ok=True)
+
+
+def write_compressed(path):
+    """Write .gz (and .br, if brotli is installed) siblings of path.
+
+    Returns {suffix: size}. The gzip header carries no timestamp, so
+    rebuilding unchanged input produces byte-identical files.
+    """
+    data = Path(path).read_bytes()
+    sizes = {'': len(data)}
+    variants = [('.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', lambda d: brotli.compress(d, quality=11)))
+    for suffix, compress in variants:
+        packed = compress(data)
+        Path(str(path) + suffix).write_bytes(packed)
+        sizes[suffix] = len(packed)
+    return sizes
+
+
+def production_assets(docs_dir=DOCS_DIR):
+    """The files a static host serves, which --production precompresses."""
+    docs_dir = Path(docs_dir)
+    assets = [docs_dir / 'index.html', docs_dir / 'selector.js', docs_dir / 'skills-catalog.json']
+    return assets + sorted((docs_dir / 'shards').glob('*.json'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build docs/index.html from docs/skills-catalog.json')
+    parser.add_argument('--shard-size', type=int, metavar='N',
+                        help='embed only a manifest and put descriptions in docs/shards/, N skills per shard')
+    parser.add_argument('--production', action='store_true',
+                        help='minify inline CSS and JSON, write .gz/.br siblings and print a size report')
+    parser.add_argument('--profile', nargs='?', type=Path, const=Path('selector-profile.json'), metavar='PATH',
+                        help='time each build phase and write the report as JSON (default: selector-profile.json)')
+    args = parser.parse_args()
+    profile = {} if args.profile else None
+    started = time.perf_counter()
+
+    # Read catalog
+    with _timed(profile, 'catalog_load'), open(DOCS_DIR / 'skills-catalog.json', 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+
+    if args.production:
+        unminified = len(render_index(catalog['skills'], minify=False).encode('utf-8'))
+    out = build_selector(catalog['skills'], shard_size=args.shard_size, minify=args.production, profile=profile)
 
-# Write the HTML
-with open('docs/index.html', 'w', encoding='utf-8') as f:
-    f.write(html)
-
-print(f"[OK] Enhanced index.html generated with {len(catalog['skills'])} skills!")
-print("All improvements applied:")
-print("  - OS selection (Windows/Linux/macOS) with multi-select")
-print("  - Script preview with copy-to-clipboard")
-print("  - GitHub links at bottom")
-print("  - Removed 'Ninite style' text")
-print("  - Fixed category filters (Cloudflare, AI/ML, DevOps)")
-print("  - Added Contribute link")
-print("  - Changed attribution to 'Claude Code Mastery Collective'")
-print("  - Improved skill descriptions")
+    print(f"[OK] Enhanced index.html generated with {len(catalog['skills'])} skills!")
+    print(f"Output: {out} ({out.stat().st_size:,} bytes)")
+    if args.production:
+        if not args.shard_size:
+            print(f"Minified: {unminified:,} -> {out.stat().st_size:,} bytes")
+        if brotli is None:
+            print("brotli is not installed, skipping .br files (pip install brotli)")
+        print(f"{'asset':<40}{'raw':>10}{'.gz':>10}{'.br':>10}")
+        for asset in production_assets():
+            with _timed(profile, 'compress'):
+                sizes = write_compressed(asset)
+            br = f"{sizes['.br']:,}" if '.br' in sizes else '-'
+            print(f"{str(asset.relative_to(DOCS_DIR)):<40}{sizes['']:>10,}{sizes['.gz']:>10,}{br:>10}")
+    elif args.shard_size:
+        for shard in sorted((DOCS_DIR / 'shards').glob('*.json')):
+            print(f"  {shard.relative_to(DOCS_DIR)}: {shard.stat().st_size:,} bytes")
+    if profile is not None:
+        report = {'total_seconds': time.perf_counter() - started, 'phases': profile}
+        with open(args.profile, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Profile ({report['total_seconds'] * 1000:.1f} ms total, written to {args.profile}):")
+        for phase, seconds in sorted(profile.items(), key=lambda item: -item[1]):
+            print(f"  {phase:<22}{seconds * 1000:>10.2f} ms")
+    print("All improvements applied:")
+    print("  - OS selection (Windows/Linux/macOS) with multi-select")
+    print("  - Script preview with copy-to-clipboard")
+    print("  - GitHub links at bottom")
+    print("  - Removed 'Ninite style' text")
+    print("  - Fixed category filters (Cloudflare, AI/ML, DevOps)")
+    print("  - Added Contribute link")
+    print("  - Changed attribution to 'Claude Code Mastery Collective'")
+    print("  - Improved skill descriptions")
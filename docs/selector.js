@@ -2,6 +2,15 @@
 let allSkills = [];
 let selectedSkills = new Set();
 
+// Inverted index from build-selector.py (embedded, or fetched by the sharded
+// build): sorted tokens and, per token, the delta-encoded positions in
+// allSkills of the skills containing it, plus the sorted suffix list
+// prepareSearchIndex() derives from the tokens. Null means scan linearly.
+let searchIndex = null;
+
+// Shown above the skill list when some shards failed to load.
+let loadNotice = '';
+
 // Debouncing variables
 let isProcessing = false;
 let searchTimeout = null;
@@ -13,8 +22,22 @@ const konamiCode = ['ArrowUp', 'ArrowUp', 'ArrowDown', 'ArrowDown', 'ArrowLeft',
 let konamiIndex = 0;
 
 function initializeSkills() {
-    if (window.EMBEDDED_SKILLS && window.EMBEDDED_SKILLS.length > 0) {
+    const manifest = window.SKILLS_MANIFEST;
+    if (manifest && manifest.skills.length > 0) {
+        // Sharded build: names and categories are inline, descriptions and
+        // the search index arrive after first paint.
+        allSkills = manifest.skills.map(([name, category]) => ({
+            name,
+            category: manifest.categories[category],
+            description: ''
+        }));
+        loadShards(manifest);
+    } else if (window.EMBEDDED_SKILLS && window.EMBEDDED_SKILLS.length > 0) {
         allSkills = window.EMBEDDED_SKILLS;
+        searchIndex = window.SKILLS_INDEX ? prepareSearchIndex(window.SKILLS_INDEX) : null;
+    }
+
+    if (allSkills.length > 0) {
         console.log(`Loaded ${allSkills.length} skills`);
 
         // Auto-detect OS and pre-select radio button
@@ -37,6 +60,39 @@ function initializeSkills() {
     }
 }
 
+function fetchJSON(file) {
+    return fetch(file).then(response => {
+        if (!response.ok) throw new Error(`${file}: HTTP ${response.status}`);
+        return response.json();
+    });
+}
+
+function loadShards(manifest) {
+    // Until the index arrives, searches fall back to scanning whatever
+    // descriptions have loaded so far.
+    const index = fetchJSON(manifest.searchIndex.file).then(data => {
+        searchIndex = prepareSearchIndex(data);
+    });
+    const shards = manifest.shards.map(shard => fetchJSON(shard.file).then(descriptions => {
+        descriptions.forEach((description, i) => {
+            allSkills[shard.start + i].description = description;
+        });
+    }));
+
+    // One failed shard only blanks its own descriptions; the rest still
+    // render, and a missing index just leaves search on the linear scan.
+    Promise.allSettled([index, ...shards]).then(outcomes => {
+        const failed = outcomes.filter(outcome => outcome.status === 'rejected');
+        failed.forEach(outcome => console.warn('Could not load skill shard:', outcome.reason.message));
+        const missing = outcomes.slice(1).filter(outcome => outcome.status === 'rejected').length;
+        if (missing > 0) {
+            loadNotice = `<div class="loading">Descriptions for some skills could not be loaded `
+                + `(${missing} of ${shards.length} files), so search may miss them. Reload to retry.</div>`;
+        }
+        renderSkills();
+    });
+}
+
 function setupEventListeners() {
     // Debounced search input
     document.getElementById('searchInput').addEventListener('input', () => {
@@ -162,9 +218,95 @@ function groupSkillsByCategory() {
     return sortedGrouped;
 }
 
+// Must agree with TOKEN_RE in build-selector.py.
+function tokenize(text) {
+    return text.toLowerCase().match(/[a-z0-9]+/g) || [];
+}
+
+// A word occurs inside a token exactly when it prefixes one of the token's
+// suffixes, and in a sorted suffix list those suffixes are contiguous. Sort
+// them once here so each lookup is two binary searches.
+function prepareSearchIndex(data) {
+    const suffixes = [];
+    data.tokens.forEach((token, id) => {
+        for (let i = 0; i < token.length; i++) {
+            suffixes.push({ text: token.slice(i), token: id });
+        }
+    });
+    suffixes.sort((a, b) => (a.text < b.text ? -1 : a.text > b.text ? 1 : 0));
+    return {
+        postings: data.postings,
+        suffixText: suffixes.map(s => s.text),
+        suffixToken: suffixes.map(s => s.token)
+    };
+}
+
+// First position in the sorted suffix list not less than `text`.
+function lowerBound(sorted, text) {
+    let lo = 0;
+    let hi = sorted.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (sorted[mid] < text) lo = mid + 1;
+        else hi = mid;
+    }
+    return lo;
+}
+
+// Skills with a word containing `word` anywhere, like the substring scan.
+function indexLookup(word) {
+    const start = lowerBound(searchIndex.suffixText, word);
+    // Query words are [a-z0-9], so '{' sorts after every suffix they prefix.
+    const end = lowerBound(searchIndex.suffixText, word + '{');
+    const tokens = new Set(searchIndex.suffixToken.slice(start, end));
+    const ids = new Set();
+    tokens.forEach(token => {
+        let id = 0;
+        searchIndex.postings[token].forEach(gap => {
+            id += gap;
+            ids.add(id);
+        });
+    });
+    return ids;
+}
+
+function matchesText(skill, searchTerm) {
+    return skill.name.toLowerCase().includes(searchTerm) ||
+           skill.description.toLowerCase().includes(searchTerm) ||
+           (skill.category || '').toLowerCase().includes(searchTerm);
+}
+
+// Returns the set of skills matching the search term, or null for "all".
+function matchingSkills(searchTerm) {
+    if (!searchTerm) return null;
+
+    const words = tokenize(searchTerm);
+    // The index only covers ASCII words, so anything else (CJK descriptions,
+    // bare punctuation) falls back to the old substring scan.
+    if (!searchIndex || words.length === 0 || /[^\x00-\x7f]/.test(searchTerm)) {
+        return new Set(allSkills.filter(skill => matchesText(skill, searchTerm)));
+    }
+
+    // A skill containing the search term contains each of its words, so the
+    // intersection narrows the candidates; a single bare word is already
+    // exact, anything longer is checked against the text itself.
+    let ids = null;
+    for (const word of words) {
+        const hits = indexLookup(word);
+        ids = ids === null ? hits : new Set([...ids].filter(id => hits.has(id)));
+        if (ids.size === 0) break;
+    }
+    let candidates = [...ids].map(id => allSkills[id]);
+    if (words.length > 1 || words[0] !== searchTerm) {
+        candidates = candidates.filter(skill => matchesText(skill, searchTerm));
+    }
+    return new Set(candidates);
+}
+
 function renderSkills() {
     const container = document.getElementById('skillsContainer');
     const searchTerm = document.getElementById('searchInput').value.toLowerCase();
+    const matches = matchingSkills(searchTerm);
 
     const groupedSkills = groupSkillsByCategory();
     let html = '';
@@ -174,10 +316,7 @@ function renderSkills() {
         const skillsInCategory = groupedSkills[category];
 
         // Filter skills by search term
-        const filteredSkills = skillsInCategory.filter(skill => {
-            return skill.name.toLowerCase().includes(searchTerm) ||
-                   skill.description.toLowerCase().includes(searchTerm);
-        });
+        const filteredSkills = skillsInCategory.filter(skill => matches === null || matches.has(skill));
 
         if (filteredSkills.length === 0) return;
 
@@ -216,9 +355,9 @@ function renderSkills() {
     });
 
     if (totalVisible === 0) {
-        container.innerHTML = '<div class="loading">No skills found matching your search.</div>';
+        container.innerHTML = loadNotice + '<div class="loading">No skills found matching your search.</div>';
     } else {
-        container.innerHTML = html;
+        container.innerHTML = loadNotice + html;
     }
 }
 
@@ -238,11 +377,9 @@ function selectAll() {
     isProcessing = true;
 
     const searchTerm = document.getElementById('searchInput').value.toLowerCase();
+    const matches = matchingSkills(searchTerm);
     allSkills.forEach(skill => {
-        const matchesSearch = skill.name.toLowerCase().includes(searchTerm) ||
-                            skill.description.toLowerCase().includes(searchTerm);
-
-        if (matchesSearch) {
+        if (matches === null || matches.has(skill)) {
             selectedSkills.add(skill.name);
         }
     });
@@ -1,98 +1,291 @@
 #!/usr/bin/env python3
 """Generate skills catalog for ClaudeSkillz"""
 
+import argparse
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import io
 import json
+import mmap
 import os
 import re
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+SKILLS_DIR = Path(__file__).parent / 'skills'
+DOCS_DIR = Path(__file__).parent / 'docs'
+DEFAULT_CACHE = Path(__file__).parent / '.catalog-cache.json'
 
-def parse_frontmatter(text):
-    """Return the YAML frontmatter of a SKILL.md as a dict of str -> str.
 
-    Only handles the small subset skills actually use: plain scalars, quoted
-    strings, '|' block scalars, '>' folded scalars, and indented continuation
-    lines. Good enough for name/description, and it never leaks a raw
-    'key: value' line into the catalog the way line-scanning did.
+_FM_OPEN = re.compile(r'---[ \t]*\r?\n')
+_FM_CLOSE = re.compile(r'---[ \t]*(?:\r?\n)?')
+_FM_KEY = re.compile(r'([A-Za-z_][A-Za-z0-9_-]*):[ \t]*(.*)')
+_BLOCK_MARKERS = ('|', '|-', '|+', '>', '>-', '>+')
+
+
+def _parse_frontmatter_lines(lines):
+    """Parse frontmatter from an iterable of raw lines, stopping at the closing '---'.
+
+    Nothing past the closing marker is pulled from the iterator, so callers
+    streaming a file never read the body.
     """
-    m = re.match(r'^---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|$)', text, re.S)
-    if not m:
+    lines = iter(lines)
+    if not _FM_OPEN.fullmatch(next(lines, '')):
         return {}
 
     fields = {}
     key = None
     buf = []
     folded = False
+    seen_body = False
 
-    def flush():
-        if key is None:
-            return
-        joined = ' '.join(p.strip() for p in buf if p.strip()) if folded else '\n'.join(buf)
-        fields[key] = joined.strip()
-
-    for line in m.group(1).split('\n'):
-        line = line.rstrip('\r')
-        head = re.match(r'^([A-Za-z_][A-Za-z0-9_-]*):[ \t]*(.*)$', line)
-        if head and not line.startswith((' ', '\t')):
-            flush()
-            key, rest = head.group(1), head.group(2).strip()
-            if rest in ('|', '|-', '|+', '>', '>-', '>+'):
-                buf, folded = [], rest.startswith('>')
-            else:
-                if len(rest) >= 2 and rest[0] == rest[-1] and rest[0] in '"\'':
-                    rest = rest[1:-1]
-                buf, folded = ([rest] if rest else []), True
-        elif key is not None and (line.startswith((' ', '\t')) or not line.strip()):
-            buf.append(line.strip() if folded else line.lstrip())
-    flush()
+    for line in lines:
+        # The first line after the opener is always body, even if it is
+        # '---': an empty frontmatter block never counted as one.
+        if seen_body and _FM_CLOSE.fullmatch(line):
+            break
+        seen_body = True
+        line = line.rstrip('\n').rstrip('\r')
+        if line[:1] in (' ', '\t') or not line.strip():
+            if key is not None:
+                buf.append(line.strip() if folded else line.lstrip())
+            continue
+        head = _FM_KEY.fullmatch(line)
+        if head is None:
+            continue
+        if key is not None:
+            fields[key] = _join_scalar(buf, folded)
+        key, rest = head.group(1), head.group(2).strip()
+        if rest in _BLOCK_MARKERS:
+            buf, folded = [], rest.startswith('>')
+        else:
+            if len(rest) >= 2 and rest[0] == rest[-1] and rest[0] in '"\'':
+                rest = rest[1:-1]
+            buf, folded = ([rest] if rest else []), True
+    else:
+        # Ran out of input without a closing marker: not frontmatter.
+        return {}
+
+    if key is not None:
+        fields[key] = _join_scalar(buf, folded)
     return fields
 
 
-def generate_catalog():
-    skills_dir = Path(__file__).parent / 'skills'
-    catalog = []
+def _join_scalar(buf, folded):
+    joined = ' '.join(p.strip() for p in buf if p.strip()) if folded else '\n'.join(buf)
+    return joined.strip()
 
-    for skill_dir in sorted(skills_dir.iterdir()):
-        if not skill_dir.is_dir():
-            continue
 
-        skill_name = skill_dir.name
-        skill_json = skill_dir / 'SKILL.json'
-        skill_md = skill_dir / 'SKILL.md'
+def parse_frontmatter(text):
+    """Return the YAML frontmatter of a SKILL.md as a dict of str -> str.
+
+    Only handles the small subset skills actually use: plain scalars, quoted
+    strings, '|' block scalars, '>' folded scalars, and indented continuation
+    lines. Good enough for name/description, and it never leaks a raw
+    'key: value' line into the catalog the way line-scanning did.
+    """
+    return _parse_frontmatter_lines(io.StringIO(text, newline='\n'))
+
+
+def _read_header(f):
+    """Return the raw lines of f up to and including the closing '---'.
+
+    Stops after the first line when it is not an opener. The result parses
+    exactly like the file itself would with _parse_frontmatter_lines().
+    """
+    lines = []
+    for line in f:
+        lines.append(line)
+        if len(lines) == 1 and not _FM_OPEN.fullmatch(line):
+            break
+        if len(lines) > 2 and _FM_CLOSE.fullmatch(line):
+            break
+    return lines
+
+
+def read_frontmatter(path, profile=None):
+    """parse_frontmatter() for a file, reading only up to the closing '---'."""
+    if profile is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            return _parse_frontmatter_lines(f)
+    # Reading and parsing are interleaved when streaming, so the profiled
+    # path reads the header first to time the two steps separately.
+    with _timed(profile, 'skill_md_read', path.parent.name):
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = _read_header(f)
+    with _timed(profile, 'frontmatter_parse', path.parent.name):
+        return _parse_frontmatter_lines(lines)
+
+
+class BuildProfile:
+    """Wall-clock time per build phase, and per skill for the slowest-N report.
+
+    Phases that run on worker threads are summed across workers, so under
+    --jobs the phase totals can add up to more than the elapsed time.
+    Profiled builds skip cache lookups, so every skill is parsed and timed.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.skills = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name, skill=None):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+                if skill is not None:
+                    record = self.skills.setdefault(skill, {'seconds': 0.0, 'phases': {}})
+                    record['seconds'] += elapsed
+                    record['phases'][name] = record['phases'].get(name, 0.0) + elapsed
+
+    def report(self, top=10):
+        """Return the profile as a JSON-serializable dict."""
+        slowest = sorted(self.skills.items(), key=lambda item: item[1]['seconds'], reverse=True)[:top]
+        return {
+            'total_seconds': time.perf_counter() - self.started,
+            'phases': self.phases,
+            'slowest_skills': [
+                {
+                    'name': name,
+                    'seconds': record['seconds'],
+                    'bytes': {
+                        source: (SKILLS_DIR / name / source).stat().st_size
+                        for source in SOURCE_FILES if (SKILLS_DIR / name / source).exists()
+                    },
+                    'phases': record['phases'],
+                }
+                for name, record in slowest
+            ],
+        }
+
+
+def _timed(profile, name, skill=None):
+    return profile.phase(name, skill) if profile else contextlib.nullcontext()
+
+
+# Category rules, highest priority first. Each keyword matches anywhere in
+# the text unless it starts with '^', which anchors it to the start. The
+# first rule with any matching keyword wins; nothing matching means General.
+CATEGORY_RULES = [
+    ('Scientific', ['^scientific-']),
+    ('Cloudflare', ['cloudflare']),
+    ('AI/ML', ['ai-', 'openai', 'gemini', 'ml-', 'llm', 'embeddings', 'agents', 'multimodal']),
+    ('DevOps', ['devops', 'docker', 'terraform', 'kubernetes', 'infrastructure']),
+    ('Web Development', ['react', 'nextjs', 'tailwind', 'web', 'frontend', 'svelte', 'vue']),
+    ('Development Tools', ['git', 'github', 'testing', 'code', 'debug', 'review']),
+    ('Automation', ['bash', 'script', 'automation', 'workflow', 'playwright']),
+]
+DEFAULT_CATEGORY = 'General'
+
+
+class CategoryClassifier:
+    """Assign categories from CATEGORY_RULES with one regex pass per text.
+
+    All rules are compiled into a single alternation, one named group per
+    rule in priority order, wrapped in a lookahead so every position in the
+    text is tried. At each position the regex reports the highest-priority
+    rule matching there, so the best rule over all positions is the one the
+    old if/elif chain would have picked, however many keywords there are.
+    """
+
+    def __init__(self, rules, default=DEFAULT_CATEGORY):
+        self.rules = rules
+        self.default = default
+        alternatives = []
+        for i, (_, keywords) in enumerate(rules):
+            patterns = ['^' + re.escape(k[1:]) if k.startswith('^') else re.escape(k) for k in keywords]
+            alternatives.append(f"(?P<r{i}>{'|'.join(patterns)})")
+        self._regex = re.compile('(?=' + '|'.join(alternatives) + ')')
+
+    def _match(self, text):
+        """Return (rule index, matched keyword) of the best rule, or None."""
+        best = None
+        for m in self._regex.finditer(text):
+            rule = int(m.lastgroup[1:])
+            if best is None or rule < best[0]:
+                best = (rule, m.group(m.lastgroup))
+                if rule == 0:
+                    break
+        return best
+
+    def explain(self, name, description=None):
+        """Return (category, reason) where reason says which rule fired.
+
+        The name is tried first; the description, when given, is only
+        consulted for names no rule matches.
+        """
+        for field, text in (('name', name), ('description', description)):
+            if text is None:
+                continue
+            best = self._match(text if field == 'name' else text.lower())
+            if best is not None:
+                category = self.rules[best[0]][0]
+                return category, f"{field} matched {best[1]!r} (rule {best[0] + 1}: {category})"
+        return self.default, 'no rule matched (default)'
+
+    def classify(self, name, description=None):
+        return self.explain(name, description)[0]
+
 
-        # SKILL.md frontmatter wins. It is what Claude Code actually loads, so
-        # treating it as the single source of truth keeps an edit there from
-        # being silently overridden by a stale SKILL.json copy.
-        description = ""
-        category = "General"
-        content = ""
+CLASSIFIER = CategoryClassifier(CATEGORY_RULES)
 
-        if skill_md.exists():
-            try:
+
+def describe_skill(skill_dir, match_description=False, profile=None):
+    """Build the catalog entry for one skill directory.
+
+    match_description lets the category rules fall back to the description
+    for skills whose name matches none of them. profile, a BuildProfile,
+    records how long each step took.
+    """
+    skill_name = skill_dir.name
+    skill_json = skill_dir / 'SKILL.json'
+    skill_md = skill_dir / 'SKILL.md'
+
+    # SKILL.md frontmatter wins. It is what Claude Code actually loads, so
+    # treating it as the single source of truth keeps an edit there from
+    # being silently overridden by a stale SKILL.json copy.
+    description = ""
+
+    if skill_md.exists():
+        try:
+            description = read_frontmatter(skill_md, profile).get('description', '').strip()
+        except:
+            pass
+
+    if not description and skill_json.exists():
+        try:
+            with _timed(profile, 'skill_json_fallback', skill_name), open(skill_json, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                description = data.get('description', '')
+                if not description and 'overview' in data:
+                    description = data['overview']
+                # Some SKILL.json files carry a bare block-scalar marker
+                # instead of a description. Treat that as absent.
+                if str(description).strip() in ('|', '|-', '|+', '>', '>-', '>+', '---'):
+                    description = ''
+        except:
+            pass
+
+    if not description and skill_md.exists():
+        # Nothing structured to work with, so fall back to the first real
+        # paragraph of prose, skipping the heading and any block markers.
+        # Only this path needs the body, so only this path reads it.
+        try:
+            with _timed(profile, 'prose_fallback', skill_name):
                 with open(skill_md, 'r', encoding='utf-8') as f:
                     content = f.read()
-                description = parse_frontmatter(content).get('description', '').strip()
-            except:
-                pass
-
-        if not description and skill_json.exists():
-            try:
-                with open(skill_json, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    description = data.get('description', '')
-                    if not description and 'overview' in data:
-                        description = data['overview']
-                    # Some SKILL.json files carry a bare block-scalar marker
-                    # instead of a description. Treat that as absent.
-                    if str(description).strip() in ('|', '|-', '|+', '>', '>-', '>+', '---'):
-                        description = ''
-            except:
-                pass
-
-        if not description and content:
-            # Nothing structured to work with, so fall back to the first real
-            # paragraph of prose, skipping the heading and any block markers.
-            try:
                 body = re.sub(r'^---[ \t]*\r?\n.*?\r?\n---[ \t]*\r?\n', '', content, flags=re.S)
                 for line in body.split('\n')[:30]:
                     line = line.strip()
@@ -101,51 +294,484 @@ def generate_catalog():
                     if len(line) > 20:
                         description = line
                         break
-            except:
-                pass
-
-        # Collapse whitespace so multi-line block scalars stay on one line.
-        description = ' '.join(description.split())
-
-        # If still no description, generate from name
-        if not description or description in ['|', '---', '>']:
-            # Convert kebab-case to readable
-            name_words = skill_name.replace('-', ' ').replace('_', ' ').title()
-            description = f"Claude Code skill for {name_words}"
-
-        # Determine category from name prefix and keywords
-        if skill_name.startswith('scientific-'):
-            category = 'Scientific'
-        elif skill_name.startswith('cloudflare-') or 'cloudflare' in skill_name:
-            category = 'Cloudflare'
-        elif any(x in skill_name for x in ['ai-', 'openai', 'gemini', 'ml-', 'llm', 'embeddings', 'agents', 'multimodal']):
-            category = 'AI/ML'
-        elif any(x in skill_name for x in ['devops', 'docker', 'terraform', 'kubernetes', 'infrastructure']):
-            category = 'DevOps'
-        elif any(x in skill_name for x in ['react', 'nextjs', 'tailwind', 'web', 'frontend', 'svelte', 'vue']):
-            category = 'Web Development'
-        elif any(x in skill_name for x in ['git', 'github', 'testing', 'code', 'debug', 'review']):
-            category = 'Development Tools'
-        elif any(x in skill_name for x in ['bash', 'script', 'automation', 'workflow', 'playwright']):
-            category = 'Automation'
-
-        catalog.append({
-            'name': skill_name,
-            'description': description[:200] if description else f"Claude Code skill: {skill_name}",
-            'category': category
-        })
+        except:
+            pass
+
+    # Collapse whitespace so multi-line block scalars stay on one line.
+    description = ' '.join(description.split())
+
+    # If still no description, generate from name
+    if not description or description in ['|', '---', '>']:
+        # Convert kebab-case to readable
+        name_words = skill_name.replace('-', ' ').replace('_', ' ').title()
+        description = f"Claude Code skill for {name_words}"
+
+    description = description[:200] if description else f"Claude Code skill: {skill_name}"
+    with _timed(profile, 'classification', skill_name):
+        category = CLASSIFIER.classify(skill_name, description if match_description else None)
+
+    return {
+        'name': skill_name,
+        'description': description,
+        'category': category
+    }
+
+
+# Bump whenever describe_skill() changes what it produces for the same input,
+# so caches written by an older version get thrown away instead of trusted.
+CACHE_VERSION = 2
+SOURCE_FILES = ('SKILL.md', 'SKILL.json')
+
+
+def _file_signature(path, with_hash=True):
+    """Return [mtime_ns, size, sha256] for path, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    digest = None
+    if with_hash:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    return [st.st_mtime_ns, st.st_size, digest]
 
-    # Save catalog
-    docs_dir = Path(__file__).parent / 'docs'
-    docs_dir.mkdir(exist_ok=True)
 
-    with open(docs_dir / 'skills-catalog.json', 'w', encoding='utf-8') as f:
+def _signature_matches(path, cached):
+    """Check a cached signature against the file on disk.
+
+    A matching mtime and size is trusted outright. When only the mtime moved
+    (a checkout, a touch, a no-op save) the content hash decides, and the
+    cached mtime is refreshed so the next run takes the cheap path again.
+    """
+    current = _file_signature(path, with_hash=False)
+    if cached is None or current is None:
+        return cached is None and current is None
+    if current[:2] == cached[:2]:
+        return True
+    if current[1] != cached[1]:
+        return False
+    fresh = _file_signature(path)
+    if fresh[2] != cached[2]:
+        return False
+    cached[0] = fresh[0]
+    return True
+
+
+def classification_fingerprint(match_description=False):
+    """Identify the category rules in effect, so a cache built under other rules is dropped."""
+    rules = json.dumps([CATEGORY_RULES, DEFAULT_CATEGORY, match_description])
+    return hashlib.sha256(rules.encode('utf-8')).hexdigest()[:16]
+
+
+class CatalogCache:
+    """Persistent per-skill cache of resolved catalog entries.
+
+    Entries are keyed by skill directory and validated against the mtime,
+    size and content hash of SKILL.md and SKILL.json, so only skills whose
+    sources actually changed get re-parsed. The whole cache is discarded
+    when its fingerprint (the category rules) no longer matches.
+    """
+
+    def __init__(self, path, fingerprint=''):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        # lookup() and store() run on worker threads under --jobs.
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION and data.get('fingerprint', '') == fingerprint:
+                self.entries = data.get('skills', {})
+        except (OSError, ValueError):
+            pass
+
+    def lookup(self, skill_dir):
+        """Return the cached entry for skill_dir, or None if it is stale."""
+        cached = self.entries.get(skill_dir.name)
+        fresh = cached is not None and all(
+            _signature_matches(skill_dir / name, cached['files'].get(name))
+            for name in SOURCE_FILES
+        )
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return cached['entry'] if fresh else None
+
+    def store(self, skill_dir, entry):
+        files = {name: _file_signature(skill_dir / name) for name in SOURCE_FILES}
+        with self._lock:
+            self.entries[skill_dir.name] = {'files': files, 'entry': entry}
+            self.dirty = True
+
+    def prune(self, names):
+        """Forget skills that are no longer on disk."""
+        for name in set(self.entries) - set(names):
+            del self.entries[name]
+            self.dirty = True
+
+    def save(self):
+        # mtimes refreshed by _signature_matches() are worth keeping too, so
+        # write whenever anything was looked at, not only on misses.
+        if not (self.dirty or self.hits):
+            return
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'fingerprint': self.fingerprint, 'skills': self.entries}, f)
+        os.replace(tmp, self.path)
+
+
+def _pool_map(fn, items, jobs, processes=False):
+    """map() over items, on a worker pool when jobs > 1.
+
+    Results always come back in input order, so the catalog is identical to
+    a serial run no matter how the work was scheduled.
+    """
+    items = list(items)
+    if jobs <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor(max_workers=jobs) as pool:
+        return list(pool.map(fn, items, chunksize=16 if processes else 1))
+
+
+def scan_skills(skills_dir, cache=None, jobs=1, processes=False, match_description=False, profile=None,
+                use_cached=True):
+    """Return the catalog entries for every skill directory, in name order.
+
+    With use_cached=False every skill is parsed again and the cache only
+    receives the fresh entries.
+    """
+    # Stat calls are the slow part on network mounts, so even the directory
+    # filter and cache validation go through the pool.
+    with _timed(profile, 'directory_walk'):
+        candidates = sorted(Path(skills_dir).iterdir())
+        skill_dirs = [d for d, is_dir in zip(candidates, _pool_map(Path.is_dir, candidates, jobs)) if is_dir]
+    with _timed(profile, 'cache_lookup'):
+        if cache and use_cached:
+            catalog = _pool_map(cache.lookup, skill_dirs, jobs)
+        else:
+            catalog = [None] * len(skill_dirs)
+
+    # Parsing is pure Python, so --processes moves it off the GIL; the skill
+    # files are then read in those worker processes too. Directory listing and
+    # cache lookups above stay on threads either way.
+    stale = [i for i, entry in enumerate(catalog) if entry is None]
+    describe = functools.partial(describe_skill, match_description=match_description, profile=profile)
+    fresh = _pool_map(describe, [skill_dirs[i] for i in stale], jobs, processes)
+    for i, entry in zip(stale, fresh):
+        catalog[i] = entry
+    if cache:
+        with _timed(profile, 'cache_store'):
+            _pool_map(lambda i: cache.store(skill_dirs[i], catalog[i]), stale, jobs)
+    return catalog
+
+
+# Compact catalog layout, all integers little-endian:
+#   header    magic, skill count, category count, string table offset
+#   categories  (offset, length) into the string table, per category
+#   records     (name offset, name length, description offset,
+#               description length, category id, padding), per skill
+#   strings     UTF-8 text the offsets point into
+# Records are fixed-size and sorted by name, so a reader can index or
+# binary-search them straight out of a memory map.
+COMPACT_MAGIC = b'SKC1'
+_COMPACT_HEADER = struct.Struct('<4sIII')
+_COMPACT_CATEGORY = struct.Struct('<II')
+_COMPACT_RECORD = struct.Struct('<IIIIHH')
+
+
+def write_compact_catalog(catalog, path):
+    """Write catalog entries in the compact layout described above."""
+    catalog = sorted(catalog, key=lambda entry: entry['name'])
+    strings = bytearray()
+    interned = {}
+
+    def intern(text):
+        if text not in interned:
+            data = text.encode('utf-8')
+            interned[text] = (len(strings), len(data))
+            strings.extend(data)
+        return interned[text]
+
+    categories = sorted({entry['category'] for entry in catalog})
+    category_ids = {category: i for i, category in enumerate(categories)}
+    category_table = b''.join(_COMPACT_CATEGORY.pack(*intern(c)) for c in categories)
+    records = b''.join(
+        _COMPACT_RECORD.pack(*intern(entry['name']), *intern(entry['description']),
+                             category_ids[entry['category']], 0)
+        for entry in catalog
+    )
+    strings_offset = _COMPACT_HEADER.size + len(category_table) + len(records)
+    with open(path, 'wb') as f:
+        f.write(_COMPACT_HEADER.pack(COMPACT_MAGIC, len(catalog), len(categories), strings_offset))
+        f.write(category_table)
+        f.write(records)
+        f.write(strings)
+    return Path(path)
+
+
+class CompactCatalog:
+    """Read-only, memory-mapped view of a catalog written by write_compact_catalog().
+
+    Nothing is decoded up front: len() and lookups by index or name only
+    touch the pages they need.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, category_count, self._strings = _COMPACT_HEADER.unpack_from(self._map)
+        if magic != COMPACT_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a compact skills catalog")
+        self._records = _COMPACT_HEADER.size + category_count * _COMPACT_CATEGORY.size
+        self.categories = [
+            self._text(*_COMPACT_CATEGORY.unpack_from(self._map, _COMPACT_HEADER.size + i * _COMPACT_CATEGORY.size))
+            for i in range(category_count)
+        ]
+
+    def _bytes(self, offset, length):
+        start = self._strings + offset
+        return self._map[start:start + length]
+
+    def _text(self, offset, length):
+        return self._bytes(offset, length).decode('utf-8')
+
+    def _record(self, i):
+        return _COMPACT_RECORD.unpack_from(self._map, self._records + i * _COMPACT_RECORD.size)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        name_off, name_len, desc_off, desc_len, category, _ = self._record(i)
+        return {
+            'name': self._text(name_off, name_len),
+            'description': self._text(desc_off, desc_len),
+            'category': self.categories[category],
+        }
+
+    def __iter__(self):
+        return (self[i] for i in range(self._count))
+
+    def get(self, name, default=None):
+        """Look a skill up by name with a binary search over the records."""
+        key = name.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name_off, name_len = self._record(mid)[:2]
+            probe = self._bytes(name_off, name_len)
+            if probe == key:
+                return self[mid]
+            if probe < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return default
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_catalog(catalog, docs_dir=DOCS_DIR, compact=False):
+    docs_dir = Path(docs_dir)
+    docs_dir.mkdir(exist_ok=True)
+    out = docs_dir / 'skills-catalog.json'
+    with open(out, 'w', encoding='utf-8') as f:
         json.dump({'skills': catalog}, f, indent=2)
+    # build-selector.py --production precompresses the catalog; those copies
+    # are stale now.
+    for suffix in ('.gz', '.br'):
+        out.with_name(out.name + suffix).unlink(missing_ok=True)
+    if compact:
+        write_compact_catalog(catalog, docs_dir / 'skills-catalog.bin')
+    return out
+
+
+def generate_catalog(cache_path=DEFAULT_CACHE, jobs=1, processes=False, compact=False,
+                     match_description=False, profile=None):
+    fingerprint = classification_fingerprint(match_description)
+    with _timed(profile, 'cache_load'):
+        cache = CatalogCache(cache_path, fingerprint) if cache_path else None
+    # A profiled build parses every skill: on a warm cache the read, parse
+    # and classification phases would otherwise be empty.
+    catalog = scan_skills(SKILLS_DIR, cache, jobs, processes, match_description, profile,
+                          use_cached=profile is None)
+
+    # Save catalog
+    with _timed(profile, 'serialization'):
+        out = write_catalog(catalog, compact=compact)
 
     print(f"Generated catalog with {len(catalog)} skills")
-    print(f"Output: {docs_dir / 'skills-catalog.json'}")
+    print(f"Output: {out}")
+    if compact:
+        print(f"Output: {out.with_suffix('.bin')}")
+
+    if cache:
+        with _timed(profile, 'cache_save'):
+            cache.prune(entry['name'] for entry in catalog)
+            cache.save()
+        if profile is None:
+            print(f"Cache: {cache.hits} hits, {cache.misses} misses ({cache.path.name})")
+        else:
+            print(f"Cache: lookups skipped while profiling, {len(catalog)} entries refreshed ({cache.path.name})")
 
     return catalog
 
+
+def _load_selector_builder():
+    """Import build-selector.py, which cannot be imported by name."""
+    spec = importlib.util.spec_from_file_location('build_selector', Path(__file__).parent / 'build-selector.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.build_selector
+
+
+def _snapshot(skills_dir):
+    """Map skill name -> (mtime_ns, size) of each source file, None if absent."""
+    state = {}
+    with os.scandir(skills_dir) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            sigs = []
+            for name in SOURCE_FILES:
+                try:
+                    st = os.stat(os.path.join(entry.path, name))
+                    sigs.append((st.st_mtime_ns, st.st_size))
+                except OSError:
+                    sigs.append(None)
+            state[entry.name] = tuple(sigs)
+    return state
+
+
+def watch(cache_path=DEFAULT_CACHE, jobs=1, processes=False, interval=0.1, debounce=0.05, compact=False,
+          match_description=False):
+    """Rebuild the catalog and selector page whenever a skill changes.
+
+    Polls skills/*/SKILL.md and SKILL.json by stat, so it works the same on
+    every platform and on network mounts. Only the skills that changed are
+    re-parsed; everything else comes from the in-memory catalog.
+    """
+    build_selector = _load_selector_builder()
+    catalog = generate_catalog(cache_path, jobs, processes, compact, match_description)
+    fingerprint = classification_fingerprint(match_description)
+    cache = CatalogCache(cache_path, fingerprint) if cache_path else None
+    entries = {entry['name']: entry for entry in catalog}
+    build_selector(catalog)
+    state = _snapshot(SKILLS_DIR)
+    print(f"Watching {SKILLS_DIR} for changes (Ctrl-C to stop)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = _snapshot(SKILLS_DIR)
+            if current == state:
+                continue
+            # Editors often save in several steps (truncate, write, rename),
+            # so wait for the tree to settle before rebuilding.
+            while True:
+                time.sleep(debounce)
+                settled = _snapshot(SKILLS_DIR)
+                if settled == current:
+                    break
+                current = settled
+
+            started = time.perf_counter()
+            changed = sorted(name for name in set(state) | set(current) if state.get(name) != current.get(name))
+            state = current
+            for name in changed:
+                if name not in current:
+                    entries.pop(name, None)
+                    continue
+                entry = describe_skill(SKILLS_DIR / name, match_description)
+                entries[name] = entry
+                if cache:
+                    cache.store(SKILLS_DIR / name, entry)
+
+            catalog = [entries[name] for name in sorted(entries)]
+            write_catalog(catalog, compact=compact)
+            build_selector(catalog)
+            if cache:
+                cache.prune(entries)
+                cache.save()
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"Rebuilt {len(changed)} skill(s) in {elapsed:.0f} ms: {', '.join(changed)}")
+    except KeyboardInterrupt:
+        pass
+
+
 if __name__ == '__main__':
-    catalog = generate_catalog()
+    parser = argparse.ArgumentParser(description='Generate docs/skills-catalog.json from skills/')
+    parser.add_argument('--cache', type=Path, default=DEFAULT_CACHE,
+                        help='per-skill cache file (default: .catalog-cache.json)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='re-parse every skill and leave the cache untouched')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='scan skills with N worker threads (default: 1, serial)')
+    parser.add_argument('--processes', action='store_true',
+                        help='with --jobs, parse in worker processes instead of threads')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and rebuild the catalog and docs/index.html on every change')
+    parser.add_argument('--interval', type=float, default=0.1, metavar='SECONDS',
+                        help='--watch polling interval (default: 0.1)')
+    parser.add_argument('--compact', action='store_true',
+                        help='also write docs/skills-catalog.bin, a memory-mappable binary catalog')
+    parser.add_argument('--classify-description', action='store_true',
+                        help='let category rules match the description when the name matches none')
+    parser.add_argument('--explain', nargs='*', metavar='SKILL',
+                        help='print which category rule fired for each skill (or just the named ones)')
+    parser.add_argument('--profile', nargs='?', type=Path, const=Path('catalog-profile.json'), metavar='PATH',
+                        help='time each build phase, parsing every skill without cache lookups, '
+                             'and write the report as JSON (default: catalog-profile.json)')
+    parser.add_argument('--profile-top', type=int, default=10, metavar='N',
+                        help='number of slowest skills to list in the profile (default: 10)')
+    args = parser.parse_args()
+    if args.profile and (args.processes or args.watch):
+        parser.error('--profile cannot be combined with --processes or --watch')
+
+    cache_path = None if args.no_cache else args.cache
+    if args.watch:
+        watch(cache_path, args.jobs, args.processes, interval=args.interval, compact=args.compact,
+              match_description=args.classify_description)
+    else:
+        profile = BuildProfile() if args.profile else None
+        catalog = generate_catalog(cache_path=cache_path, jobs=args.jobs, processes=args.processes,
+                                   compact=args.compact, match_description=args.classify_description,
+                                   profile=profile)
+        if profile:
+            report = profile.report(args.profile_top)
+            with open(args.profile, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"\nProfile ({report['total_seconds'] * 1000:.1f} ms total, written to {args.profile}):")
+            for phase, seconds in sorted(report['phases'].items(), key=lambda item: -item[1]):
+                print(f"  {phase:<22}{seconds * 1000:>10.2f} ms")
+            print(f"Slowest {len(report['slowest_skills'])} skills:")
+            for skill in report['slowest_skills']:
+                size = sum(skill['bytes'].values())
+                print(f"  {skill['name']:<48}{skill['seconds'] * 1000:>8.2f} ms{size:>10,} bytes")
+        if args.explain is not None:
+            wanted = set(args.explain)
+            for entry in catalog:
+                if wanted and entry['name'] not in wanted:
+                    continue
+                description = entry['description'] if args.classify_description else None
+                category, reason = CLASSIFIER.explain(entry['name'], description)
+                print(f"{entry['name']}: {category} <- {reason}")
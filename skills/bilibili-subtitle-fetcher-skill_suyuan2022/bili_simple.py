@@ -7,17 +7,28 @@ B站视频搜索和字幕获取工具 - 简洁版
 
 import requests
 import certifi
+import asyncio
+import ssl
+import sqlite3
 import json
 import re
 import time
-import random
+import threading
 import urllib.parse
 import os
+import sys
+import random
 from hashlib import md5
-from functools import reduce
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import reduce, partial
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 
+try:
+    import aiohttp
+except ImportError:  # 没有 aiohttp 时, 异步引擎在线程中执行 requests 请求
+    aiohttp = None
+
 
 # ==================== 配置管理 ====================
 def load_config():
@@ -56,9 +67,264 @@ def load_config():
         return None
 
 
+# ==================== 请求限流 ====================
+# 各接口默认限流参数: rate 为每秒补充的令牌数(即稳定请求速率), burst 为最多积累的令牌数
+DEFAULT_RATE_LIMITS = {
+    'search': {'rate': 0.5, 'burst': 2},     # 搜索接口最容易触发风控
+    'view': {'rate': 2, 'burst': 4},         # 视频信息
+    'player': {'rate': 2, 'burst': 4},       # x/player/v2 字幕列表
+    'subtitle': {'rate': 5, 'burst': 10},    # 字幕文件 CDN
+}
+
+
+def rate_limits_from_settings(settings):
+    """读取 settings.rate_limits, 并兼容旧版的 request_delay_min/max(秒)
+
+    旧版在所有请求之间等待 min~max 秒。这里按平均间隔换算成速率, 对没有在
+    rate_limits 中显式设置 rate 的接口取换算值与默认值中较慢的一个。
+    """
+    limits = {name: dict(limit) for name, limit in (settings.get('rate_limits') or {}).items()}
+    if 'request_delay_min' not in settings and 'request_delay_max' not in settings:
+        return limits
+    low = settings.get('request_delay_min', 1)
+    high = settings.get('request_delay_max', low)
+    rate = 1 / max((low + high) / 2, 0.01)
+    print(f"⚠️  settings.request_delay_min/max 已弃用, 已换算为每个接口最多 {rate:.2f} 次/秒, "
+          f"请改用 settings.rate_limits")
+    for name, defaults in DEFAULT_RATE_LIMITS.items():
+        limit = limits.setdefault(name, {})
+        if 'rate' not in limit and rate < defaults['rate']:
+            limit['rate'] = rate
+            limit.setdefault('burst', 1)
+    return limits
+
+
+class TokenBucket:
+    """令牌桶限流器(线程安全)
+
+    令牌以 rate 个/秒的速度补充, 最多积累 burst 个。每个请求在锁内预约一个
+    令牌(允许透支), 再在锁外睡眠到轮到自己为止, 因此多线程按预约顺序排队,
+    既不会忙等, 空闲之后的请求也无需等待。
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(float(burst), 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        # 统计信息
+        self.requests = 0
+        self.throttled = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self):
+        """预约一个令牌, 返回调用方还需等待的秒数(异步代码可以自行 await)"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = max(0.0, -self.tokens / self.rate)
+            self.requests += 1
+            self.throttled += wait
+            self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def acquire(self):
+        """阻塞直到拿到令牌, 返回等待的秒数"""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """按接口分别限流, 并统计各接口被限流的时间"""
+
+    def __init__(self, limits=None):
+        limits = limits or {}
+        self.buckets = {
+            name: TokenBucket(**{**defaults, **limits.get(name, {})})
+            for name, defaults in DEFAULT_RATE_LIMITS.items()
+        }
+
+    def acquire(self, endpoint):
+        return self.buckets[endpoint].acquire()
+
+    def reserve(self, endpoint):
+        return self.buckets[endpoint].reserve()
+
+    def stats(self):
+        """各接口的请求数、累计等待时间和最长单次等待(秒)"""
+        return {
+            name: {'requests': b.requests, 'throttled': round(b.throttled, 3), 'max_wait': round(b.max_wait, 3)}
+            for name, b in self.buckets.items()
+        }
+
+    def report(self):
+        lines = ["⏱️  限流统计:"]
+        for name, s in self.stats().items():
+            if s['requests']:
+                lines.append(f"   {name}: {s['requests']} 次请求, 共等待 {s['throttled']:.1f} 秒"
+                             f"(最长 {s['max_wait']:.1f} 秒)")
+        return "\n".join(lines)
+
+
+# ==================== 响应缓存 ====================
+# 各接口缓存有效期(秒); 过期后带 ETag/Last-Modified 重新验证
+DEFAULT_CACHE_TTLS = {
+    'search': 3600,              # 搜索结果变化快
+    'view': 86400,               # 视频信息
+    'player': 6 * 3600,          # 字幕列表里的地址可能带时效签名
+    'subtitle': 30 * 86400,      # 字幕文件内容不变
+}
+DEFAULT_CACHE_MAX_MB = 200
+
+
+class OfflineCacheMiss(Exception):
+    """离线模式下缓存中没有该请求"""
+
+
+class CachedResponse:
+    def __init__(self, key, body, fresh, etag, last_modified):
+        self.key = key
+        self.body = body
+        self.fresh = fresh
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def json(self):
+        return json.loads(self.body)
+
+    def validators(self):
+        """条件请求头, 服务器支持时可以用 304 省去重新下载"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """基于 SQLite 的持久化 HTTP 响应缓存(线程安全)
+
+    以 URL 和参数为键保存响应体及 ETag/Last-Modified; 按接口设定有效期,
+    总大小超过上限时按最近访问时间淘汰(LRU)。
+    """
+
+    def __init__(self, path, ttls=None, max_mb=DEFAULT_CACHE_MAX_MB):
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.max_bytes = max_mb * 1024 * 1024
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, endpoint TEXT, url TEXT, body BLOB, etag TEXT, last_modified TEXT,'
+            ' fetched_at REAL, accessed_at REAL, size INTEGER)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self.db.commit()
+        # 统计信息
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(url, params=None):
+        return md5(json.dumps([url, sorted((params or {}).items())], ensure_ascii=False).encode()).hexdigest()
+
+    def lookup(self, endpoint, url, params=None):
+        """返回缓存的响应(可能已过期, 见 fresh), 没有则返回 None"""
+        key = self.key(url, params)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                'SELECT body, fetched_at, etag, last_modified FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self.db.commit()
+        body, fetched_at, etag, last_modified = row
+        return CachedResponse(key, body, now - fetched_at < self.ttls.get(endpoint, 0), etag, last_modified)
+
+    def store(self, endpoint, url, params, body, headers):
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (self.key(url, params), endpoint, url, body, headers.get('ETag'), headers.get('Last-Modified'),
+                 now, now, len(body)))
+            self._evict()
+            self.db.commit()
+
+    def refresh(self, cached):
+        """304 之后刷新缓存时间"""
+        with self.lock:
+            self.db.execute('UPDATE responses SET fetched_at = ? WHERE key = ?', (time.time(), cached.key))
+            self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute('SELECT key, size FROM responses ORDER BY accessed_at').fetchall():
+            if total <= self.max_bytes:
+                break
+            self.db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+
+    def report(self):
+        return f"💾 缓存: 命中 {self.hits} 次, 重新验证 {self.revalidated} 次, 网络请求 {self.misses} 次"
+
+
+def _cacheable(endpoint, data):
+    """只缓存成功的响应: API 接口要求 code == 0, 避免把风控/错误结果缓存下来"""
+    return endpoint == 'subtitle' or data.get('code') == 0
+
+
+# ==================== 失败重试 ====================
+RETRY_BASE_DELAY = 1.0     # 首次重试等待(秒), 之后每次翻倍
+RETRY_MAX_DELAY = 30.0
+DEFAULT_MAX_RETRIES = 3
+RETRY_STATUSES = {412, 429, 500, 502, 503, 504}
+# 风控/请求过于频繁; 其他非 0 的 code(如 -404 视频不存在)重试也没有用
+RETRY_CODES = {-352, -412, -509, -799}
+
+
+def backoff_delay(attempt):
+    """第 attempt 次重试前的等待时间: 指数退避加随机抖动"""
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+def is_retryable(error):
+    """网络错误和限流/服务端错误的 HTTP 状态可以重试"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(error, 'status', None)
+    if status is not None:
+        return status in RETRY_STATUSES
+    if aiohttp is not None and isinstance(error, aiohttp.ClientConnectionError):
+        return True
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, asyncio.TimeoutError))
+
+
+def should_retry(attempt, retries, error=None, data=None):
+    """还有重试次数, 且失败是暂时性的(见 is_retryable 和 RETRY_CODES)"""
+    if attempt >= retries:
+        return False
+    if error is not None:
+        return is_retryable(error)
+    return isinstance(data, dict) and data.get('code') in RETRY_CODES
+
+
 # ==================== API 请求封装 ====================
+SEARCH_PAGE_SIZE = 50      # 搜索接口单页上限
+SEARCH_MAX_PAGES = 50      # 搜索接口最多返回 50 页
+
+
 class BilibiliAPI:
-    def __init__(self, config):
+    def __init__(self, config, use_cache=True, offline=False, retries=0):
         self.config = config
         self.session = requests.Session()
         self.session.verify = certifi.where()
@@ -71,28 +337,82 @@ class BilibiliAPI:
         cookies = config.get('cookies', {})
         self.session.cookies.update(cookies)
         
-        # 请求频率控制
-        self.last_request_time = 0
-        self.min_delay = config.get('settings', {}).get('request_delay_min', 1)
-        self.max_delay = config.get('settings', {}).get('request_delay_max', 3)
+        # 请求频率控制: 每个接口一个令牌桶, 多线程共享
+        settings = config.get('settings', {})
+        self.limiter = RateLimiter(rate_limits_from_settings(settings))
+
+        # 暂时性失败(网络、限流)按指数退避重试的次数
+        self.retries = retries
 
-    def _rate_limit(self):
+        # 响应缓存; 离线模式只从缓存读取
+        self.offline = offline
+        self.cache = None
+        if use_cache or offline:
+            cache_path = settings.get('cache_path') or Path(__file__).parent / 'http_cache.sqlite3'
+            self.cache = ResponseCache(cache_path, settings.get('cache_ttls'),
+                                       settings.get('cache_max_mb', DEFAULT_CACHE_MAX_MB))
+
+    def _rate_limit(self, endpoint):
         """请求频率控制"""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        
-        if elapsed < self.min_delay:
-            sleep_time = self.min_delay - elapsed + random.uniform(0, 0.5)
-            time.sleep(sleep_time)
-        else:
-            time.sleep(random.uniform(0, self.min_delay))
-            
-        self.last_request_time = time.time()
+        self.limiter.acquire(endpoint)
+
+    def _from_cache(self, endpoint, url, params):
+        """返回 (可直接使用的数据, 需要重新验证的缓存项)"""
+        cached = self.cache.lookup(endpoint, url, params) if self.cache else None
+        if cached and (cached.fresh or self.offline):
+            self.cache.hits += 1
+            return cached.json(), None
+        if self.offline:
+            raise OfflineCacheMiss(f"离线模式: 缓存中没有 {url}")
+        return None, cached
+
+    def _after_fetch(self, endpoint, url, params, cached, status, body, headers):
+        """处理网络响应: 304 使用缓存, 成功的响应写入缓存"""
+        if status == 304 and cached:
+            self.cache.revalidated += 1
+            self.cache.refresh(cached)
+            return cached.json()
+        data = json.loads(body)
+        if self.cache:
+            self.cache.misses += 1
+            if _cacheable(endpoint, data):
+                self.cache.store(endpoint, url, params, body, headers)
+        return data
+
+    def _get_json(self, endpoint, url, params=None):
+        """经过缓存和限流的 GET 请求, 返回解析后的 JSON
+
+        网络错误、限流类 HTTP 状态和风控 code 按指数退避最多重试 self.retries 次;
+        其他错误(如视频不存在)立即返回, 由调用方处理。
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = backoff_delay(attempt)
+                print(f"🔁 {delay:.1f} 秒后重试 ({attempt}/{self.retries}): {url}")
+                time.sleep(delay)
+            try:
+                data = self._fetch_json(endpoint, url, params)
+            except Exception as e:
+                if should_retry(attempt, self.retries, error=e):
+                    continue
+                raise
+            if not should_retry(attempt, self.retries, data=data):
+                return data
+
+    def _fetch_json(self, endpoint, url, params=None):
+        data, cached = self._from_cache(endpoint, url, params)
+        if data is not None:
+            return data
+        self._rate_limit(endpoint)
+        response = self.session.get(url, params=params, timeout=10,
+                                    headers=cached.validators() if cached else None)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return self._after_fetch(endpoint, url, params, cached, response.status_code,
+                                 response.content, response.headers)
 
     def search_videos(self, keyword, page=1, page_size=10):
         """搜索视频"""
-        self._rate_limit()
-        
         url = "https://api.bilibili.com/x/web-interface/search/type"
         params = {
             'search_type': 'video',
@@ -102,9 +422,7 @@ class BilibiliAPI:
         }
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json('search', url, params)
             
             if data.get('code') == 0:
                 return data.get('data', {}).get('result', [])
@@ -116,17 +434,21 @@ class BilibiliAPI:
             print(f"❌ 请求异常: {e}")
             return []
 
+    def iter_search(self, keyword, page_size=SEARCH_PAGE_SIZE, max_pages=SEARCH_MAX_PAGES):
+        """逐页搜索视频, 惰性产出原始搜索结果; 取完最后一页或请求失败时结束"""
+        for page in range(1, max_pages + 1):
+            results = self.search_videos(keyword, page=page, page_size=page_size)
+            yield from results
+            if len(results) < page_size:
+                return
+
     def get_video_info(self, bvid):
         """获取视频详细信息"""
-        self._rate_limit()
-        
         url = "https://api.bilibili.com/x/web-interface/view"
         params = {'bvid': bvid}
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json('view', url, params)
             
             if data.get('code') == 0:
                 return data.get('data')
@@ -140,15 +462,11 @@ class BilibiliAPI:
 
     def get_subtitle_list(self, bvid):
         """获取视频字幕列表"""
-        self._rate_limit()
-        
         url = "https://api.bilibili.com/x/player/v2"
         params = {'bvid': bvid}
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json('player', url, params)
             
             if data.get('code') == 0:
                 subtitle_info = data.get('data', {}).get('subtitle', {})
@@ -156,20 +474,16 @@ class BilibiliAPI:
                 return subtitles
             else:
                 print(f"❌ 获取字幕信息失败: {data.get('message', '未知错误')}")
-                return []
+                return None
                 
         except Exception as e:
             print(f"❌ 请求异常: {e}")
-            return []
+            return None
 
     def download_subtitle(self, subtitle_url):
         """下载字幕文件"""
-        self._rate_limit()
-        
         try:
-            response = self.session.get(subtitle_url, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json('subtitle', subtitle_url)
         except Exception as e:
             print(f"❌ 下载字幕失败: {e}")
             return None
@@ -226,94 +540,496 @@ def convert_to_markdown(subtitle_data, video_title, output_dir):
         return None
 
 
+# ==================== 任务日志 ====================
+def is_valid_output(path):
+    """输出文件存在且是完整的字幕 Markdown(以标题行开头)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return f.readline().startswith('# ')
+    except (OSError, TypeError, UnicodeDecodeError):
+        return False
+
+
+class JobJournal:
+    """批量下载的任务日志(追加写入的 JSONL)
+
+    每行记录一个 BV 号的状态变化: pending → info → subtitle → written, 失败为 failed。
+    打开已有日志时回放, 只保留最新状态为 written 的 BV 号及其输出路径, 供 --resume
+    跳过已完成的视频; 本次运行的记录只追加到文件, 不在内存中累积。
+    path 为 None 时不写文件。
+    """
+
+    STATES = ('pending', 'info', 'subtitle', 'written', 'failed')
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.lock = threading.Lock()
+        self.done = {}
+        self.errors = {}  # 失败原因, 由 take_error() 取走
+        self.file = None
+        if self.path is None:
+            return
+        needs_newline = False
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    needs_newline = not line.endswith('\n')
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 上次中断时写了一半的行
+                    if entry.get('state') == 'written':
+                        self.done[entry['bvid']] = entry.get('path')
+                    else:
+                        self.done.pop(entry.get('bvid'), None)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if needs_newline:
+            self.file.write('\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def record(self, bvid, state, **fields):
+        """记录状态变化, 每行写完立即刷新, 中断时最多丢失正在写的一行"""
+        entry = {'bvid': bvid, 'state': state, 'time': round(time.time(), 3), **fields}
+        with self.lock:
+            if state == 'failed':
+                self.errors[bvid] = fields.get('error')
+            if self.file:
+                self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                self.file.flush()
+
+    def take_error(self, bvid):
+        """取走并返回 bvid 最近一次记录的失败原因"""
+        with self.lock:
+            return self.errors.pop(bvid, None)
+
+    def completed(self, bvid):
+        """日志中已写出且输出文件仍然有效时返回文件路径, 否则返回 None"""
+        path = self.done.get(bvid)
+        return path if is_valid_output(path) else None
+
+
 # ==================== 主要功能函数 ====================
-def search_videos(api, keyword, min_play_count=50000, max_results=5):
-    """搜索高质量视频"""
-    print(f"🔍 搜索关键词: {keyword}")
-    
-    videos = api.search_videos(keyword, page_size=max_results)
-    filtered_videos = []
-    
-    for video in videos:
+def iter_search_videos(api, keyword, min_play_count=50000, max_pages=SEARCH_MAX_PAGES):
+    """逐页搜索并按播放量过滤, 惰性产出视频信息(只在需要下一页时才请求)"""
+    for video in api.iter_search(keyword, max_pages=max_pages):
         try:
+            if not video.get('bvid'):
+                print(f"⚠️  跳过没有 BV 号的搜索结果: {video.get('title', '')}")
+                continue
             play_count = video.get('play', 0)
             
             if play_count >= min_play_count:
-                video_info = {
+                yield {
                     'bvid': video.get('bvid'),
                     'title': video.get('title', '').replace('<em class="keyword">', '').replace('</em>', ''),
                     'author': video.get('author'),
                     'play_count': play_count,
                     'description': video.get('description', '')[:100]
                 }
-                filtered_videos.append(video_info)
         except Exception as e:
             continue
-    
-    return filtered_videos
 
 
-def download_subtitle_for_video(api, bvid, output_dir="subtitles"):
-    """下载单个视频的字幕"""
+def search_videos(api, keyword, min_play_count=50000, max_results=5, max_pages=None):
+    """搜索高质量视频
+
+    交互式搜索默认只多翻一页留给播放量过滤: 冷门关键词不会把 50 页
+    都翻完(受限流约束约需 100 秒)。批量搜索用 iter_search_videos 不设上限。
+    """
+    print(f"🔍 搜索关键词: {keyword}")
+    if max_pages is None:
+        max_pages = -(-max_results // SEARCH_PAGE_SIZE) + 1
+    return list(islice(iter_search_videos(api, keyword, min_play_count, max_pages), max_results))
+
+
+BVID_PATTERN = re.compile(r'BV[0-9A-Za-z]{10}')
+
+
+def read_bvids(lines):
+    """逐行读取 BV 号(也接受视频链接), 忽略空行和 # 开头的注释"""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        match = BVID_PATTERN.search(line)
+        if match:
+            yield match.group(0)
+        else:
+            print(f"⚠️  无法识别的 BV 号: {line}")
+
+
+def read_bvid_file(path):
+    """从文件流式读取 BV 号, '-' 表示标准输入"""
+    if path == '-':
+        yield from read_bvids(sys.stdin)
+        return
+    with open(path, encoding='utf-8') as f:
+        yield from read_bvids(f)
+
+
+def chinese_subtitle_url(subtitles):
+    """返回第一个中文字幕的地址(补全 // 开头的协议), 没有则返回 None"""
+    for subtitle in subtitles:
+        if '中文' in subtitle.get('lan_doc', '') or subtitle.get('lan') == 'zh-CN':
+            url = subtitle.get('url')
+            if url and url.startswith('//'):
+                url = 'https:' + url
+            return url or None
+    return None
+
+
+def download_subtitle_for_video(api, bvid, output_dir="subtitles", journal=None):
+    """下载单个视频的字幕
+
+    journal 记录各阶段状态; 暂时性的请求失败由 api 按指数退避重试。
+    """
     print(f"📥 正在下载视频 {bvid} 的字幕...")
+    journal = journal or JobJournal()
     
     # 获取视频信息
     video_info = api.get_video_info(bvid)
     if not video_info:
         print(f"❌ 获取视频信息失败: {bvid}")
+        journal.record(bvid, 'failed', error='获取视频信息失败')
         return None
     
     video_title = video_info.get('title', '未知标题')
     print(f"📹 视频标题: {video_title}")
+    journal.record(bvid, 'info', title=video_title)
     
     # 获取字幕列表
     subtitles = api.get_subtitle_list(bvid)
     if not subtitles:
         print(f"⚠️  视频 {bvid} 没有找到字幕")
+        journal.record(bvid, 'failed', error='获取字幕信息失败' if subtitles is None else '没有字幕')
         return None
     
     # 下载第一个中文字幕
-    for subtitle in subtitles:
-        if '中文' in subtitle.get('lan_doc', '') or subtitle.get('lan') == 'zh-CN':
-            subtitle_url = subtitle.get('url')
-            if subtitle_url:
-                subtitle_data = api.download_subtitle(subtitle_url)
-                if subtitle_data:
-                    output_path = convert_to_markdown(subtitle_data, video_title, output_dir)
-                    if output_path:
-                        print(f"✅ 字幕下载成功: {output_path}")
-                        return output_path
-            break
-    
-    print(f"❌ 视频 {bvid} 没有找到中文字幕")
-    return None
+    subtitle_url = chinese_subtitle_url(subtitles)
+    if not subtitle_url:
+        print(f"❌ 视频 {bvid} 没有找到中文字幕")
+        journal.record(bvid, 'failed', error='没有找到中文字幕')
+        return None
+
+    subtitle_data = api.download_subtitle(subtitle_url)
+    if not subtitle_data:
+        journal.record(bvid, 'failed', error='下载字幕失败')
+        return None
+    journal.record(bvid, 'subtitle')
+
+    output_path = convert_to_markdown(subtitle_data, video_title, output_dir)
+    if not output_path:
+        journal.record(bvid, 'failed', error='保存字幕失败')
+        return None
+    print(f"✅ 字幕下载成功: {output_path}")
+    journal.record(bvid, 'written', path=str(output_path))
+    return output_path
+
+
+class BatchTally:
+    """批量下载的结果统计: 每个结果完成时输出一行, 只保留计数"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.total = self.success = self.skipped = 0
+
+    def add(self, bvid, path=None, error=None, skipped=False):
+        with self.lock:
+            self.total += 1
+            if path:
+                self.success += 1
+                self.skipped += skipped
+        if path:
+            print(f"✅ {bvid}: {path}" + (" (此前已完成)" if skipped else ""))
+        else:
+            print(f"❌ {bvid}: {error or '失败'}")
+
+    def summary(self):
+        return {'total': self.total, 'success': self.success, 'skipped': self.skipped,
+                'failed': self.total - self.success}
+
 
+def pending_bvids(journal, bvids, resume, tally):
+    """逐个产出需要下载的 BV 号(去重), 可以是任意迭代器
 
-def batch_download_subtitles(api, bvid_list, output_dir="subtitles", max_workers=3):
-    """批量下载字幕"""
-    print(f"🚀 开始批量下载 {len(bvid_list)} 个视频的字幕...")
+    resume 时日志中已完成的直接计入 tally 并跳过, 待处理的在日志中记为 pending。
+    去重只需记住见过的 BV 号。
+    """
+    seen = set()
+    for bvid in bvids:
+        if bvid in seen:
+            continue
+        seen.add(bvid)
+        path = journal.completed(bvid) if resume else None
+        if path:
+            tally.add(bvid, path, skipped=True)
+            continue
+        journal.record(bvid, 'pending')
+        yield bvid
+
+
+def batch_size_note(bvid_list):
+    """流式输入事先不知道数量"""
+    return f" {len(bvid_list)} 个视频的" if hasattr(bvid_list, '__len__') else ""
+
+
+def print_batch_summary(api, tally, journal):
+    """输出批量下载统计"""
+    skipped_note = f" (其中 {tally.skipped} 个此前已完成)" if tally.skipped else ""
+    print(f"\n📊 下载完成: 成功 {tally.success}/{tally.total} 个{skipped_note}")
+    if journal.path:
+        print(f"📒 任务日志: {journal.path}")
+    print(api.limiter.report())
+    if api.cache:
+        print(api.cache.report())
+
+
+def batch_download_subtitles(api, bvid_list, output_dir="subtitles", max_workers=3,
+                             journal=None, resume=False):
+    """批量下载字幕
+
+    journal 为 JobJournal 时记录每个视频的进度; resume=True 跳过日志中已写出
+    且文件仍然有效的视频。bvid_list 可以是生成器(文件、分页搜索), 只预取
+    max_workers * 2 个; 每个结果完成时即输出, 内存中只保留计数。
+    返回 {'total', 'success', 'skipped', 'failed'} 计数。
+    """
+    print(f"🚀 开始批量下载{batch_size_note(bvid_list)}字幕...")
     
     # 创建输出目录
     Path(output_dir).mkdir(exist_ok=True)
+    journal = journal or JobJournal()
     
-    results = []
+    tally = BatchTally()
+    todo = pending_bvids(journal, bvid_list, resume, tally)
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_bvid = {executor.submit(download_subtitle_for_video, api, bvid, output_dir): bvid for bvid in bvid_list}
-        
-        for future in as_completed(future_to_bvid):
-            bvid = future_to_bvid[future]
-            try:
-                result = future.result()
-                results.append({'bvid': bvid, 'success': result is not None, 'path': result})
-            except Exception as e:
-                print(f"❌ 下载 {bvid} 时出现异常: {e}")
-                results.append({'bvid': bvid, 'success': False, 'error': str(e)})
+        future_to_bvid = {}
+
+        def submit(count):
+            for bvid in islice(todo, count):
+                future = executor.submit(download_subtitle_for_video, api, bvid, output_dir, journal)
+                future_to_bvid[future] = bvid
+
+        submit(max_workers * 2)
+        while future_to_bvid:
+            done, _ = wait(future_to_bvid, return_when=FIRST_COMPLETED)
+            for future in done:
+                bvid = future_to_bvid.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ 下载 {bvid} 时出现异常: {e}")
+                    journal.record(bvid, 'failed', error=str(e))
+                    result = None
+                tally.add(bvid, result, journal.take_error(bvid))
+            submit(len(done))
     
     # 统计结果
-    success_count = sum(1 for r in results if r['success'])
-    print(f"\n📊 下载完成: 成功 {success_count}/{len(bvid_list)} 个")
+    print_batch_summary(api, tally, journal)
     
-    return results
+    return tally.summary()
+
+
+# ==================== 异步下载引擎 ====================
+class AsyncBilibiliAPI:
+    """异步版 API 客户端
+
+    与同步的 BilibiliAPI 共用配置和令牌桶限流; 用有界信号量限制同时进行的
+    请求数。安装了 aiohttp 时使用异步 HTTP 客户端, 否则在线程中执行 requests。
+    """
+
+    def __init__(self, api, max_connections=16):
+        self.api = api
+        self.semaphore = asyncio.BoundedSemaphore(max_connections)
+        self.max_connections = max_connections
+        self.session = None
+        self.executor = None
+
+    async def __aenter__(self):
+        # 阻塞操作(无 aiohttp 时的请求、写文件)使用专用线程池, 不受默认线程池大小限制
+        self.executor = ThreadPoolExecutor(max_workers=self.max_connections)
+        if aiohttp is not None:
+            connector = aiohttp.TCPConnector(
+                ssl=ssl.create_default_context(cafile=certifi.where()), limit=self.max_connections)
+            self.session = aiohttp.ClientSession(
+                headers=self.api.config.get('headers', {}),
+                cookies=self.api.config.get('cookies', {}),
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10),
+            )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.session is not None:
+            await self.session.close()
+        self.executor.shutdown(wait=False)
+
+    async def run_blocking(self, fn, *args, **kwargs):
+        """在线程池中执行阻塞函数"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    async def _get_json(self, endpoint, url, params=None):
+        """与 BilibiliAPI._get_json 相同的重试规则, 等待期间只占用当前协程"""
+        retries = self.api.retries
+        for attempt in range(retries + 1):
+            if attempt:
+                await asyncio.sleep(backoff_delay(attempt))
+            try:
+                data = await self._fetch_json(endpoint, url, params)
+            except Exception as e:
+                if should_retry(attempt, retries, error=e):
+                    continue
+                raise
+            if not should_retry(attempt, retries, data=data):
+                return data
+
+    async def _fetch_json(self, endpoint, url, params=None):
+        # 缓存与同步客户端共用: 新鲜的缓存直接返回, 不占用限流令牌
+        data, cached = self.api._from_cache(endpoint, url, params)
+        if data is not None:
+            return data
+        headers = cached.validators() if cached else None
+        await asyncio.sleep(self.api.limiter.reserve(endpoint))
+        async with self.semaphore:
+            if self.session is None:
+                response = await self.run_blocking(
+                    self.api.session.get, url, params=params, timeout=10, headers=headers)
+                status, body, response_headers = response.status_code, response.content, response.headers
+                if status != 304:
+                    response.raise_for_status()
+            else:
+                async with self.session.get(url, params=params, headers=headers) as response:
+                    if response.status != 304:
+                        response.raise_for_status()
+                    status, body, response_headers = response.status, await response.read(), response.headers
+        return self.api._after_fetch(endpoint, url, params, cached, status, body, response_headers)
+
+    async def _get_data(self, endpoint, url, params, error):
+        try:
+            data = await self._get_json(endpoint, url, params)
+        except Exception as e:
+            print(f"❌ 请求异常: {e}")
+            return None
+        if data.get('code') == 0:
+            return data.get('data') or {}
+        print(f"❌ {error}: {data.get('message', '未知错误')}")
+        return None
+
+    async def get_video_info(self, bvid):
+        """获取视频详细信息"""
+        return await self._get_data(
+            'view', "https://api.bilibili.com/x/web-interface/view", {'bvid': bvid}, '获取视频信息失败')
+
+    async def get_subtitle_list(self, bvid):
+        """获取视频字幕列表(请求失败返回 None)"""
+        data = await self._get_data(
+            'player', "https://api.bilibili.com/x/player/v2", {'bvid': bvid}, '获取字幕信息失败')
+        if data is None:
+            return None
+        return data.get('subtitle', {}).get('subtitles', [])
+
+    async def download_subtitle(self, subtitle_url):
+        """下载字幕文件"""
+        try:
+            return await self._get_json('subtitle', subtitle_url)
+        except Exception as e:
+            print(f"❌ 下载字幕失败: {e}")
+            return None
+
+
+async def async_batch_download_subtitles(api, bvid_list, output_dir="subtitles", concurrency=16,
+                                         journal=None, resume=False):
+    """异步批量下载字幕
+
+    三个阶段通过有界队列连接成生产者/消费者流水线: 查询(视频信息与字幕列表
+    并发请求) → 下载字幕 → 写 Markdown(在线程中执行)。各阶段同时进行,
+    请求速率仍受令牌桶约束, 队列有界保证数千个 BV 号时内存不会膨胀。
+    暂时性的请求失败按指数退避重试; journal/resume 与同步版相同。
+    返回值与 batch_download_subtitles 相同(计数)。
+    """
+    print(f"🚀 开始异步批量下载{batch_size_note(bvid_list)}字幕(并发 {concurrency})...")
+    Path(output_dir).mkdir(exist_ok=True)
+    journal = journal or JobJournal()
+
+    tally = BatchTally()
+    todo = pending_bvids(journal, bvid_list, resume, tally)
+    lookups = asyncio.Queue(maxsize=concurrency * 2)
+    downloads = asyncio.Queue(maxsize=concurrency * 2)
+    writes = asyncio.Queue(maxsize=concurrency * 2)
+
+    def finish(bvid, path=None, error=None):
+        if path:
+            journal.record(bvid, 'written', path=str(path))
+        else:
+            journal.record(bvid, 'failed', error=error)
+        tally.add(bvid, path, journal.take_error(bvid))
+
+    async def stage(queue, handle):
+        while True:
+            item = await queue.get()
+            try:
+                await handle(*item)
+            except Exception as e:
+                finish(item[0], error=str(e))
+            finally:
+                queue.task_done()
+
+    async with AsyncBilibiliAPI(api, max_connections=concurrency) as client:
+        async def lookup(bvid):
+            video_info, subtitles = await asyncio.gather(
+                client.get_video_info(bvid), client.get_subtitle_list(bvid))
+            if not video_info:
+                return finish(bvid, error='获取视频信息失败')
+            if subtitles is None:
+                return finish(bvid, error='获取字幕信息失败')
+            subtitle_url = chinese_subtitle_url(subtitles)
+            if not subtitle_url:
+                return finish(bvid, error='没有找到中文字幕')
+            video_title = video_info.get('title', '未知标题')
+            journal.record(bvid, 'info', title=video_title)
+            await downloads.put((bvid, video_title, subtitle_url))
+
+        async def download(bvid, video_title, subtitle_url):
+            subtitle_data = await client.download_subtitle(subtitle_url)
+            if not subtitle_data:
+                return finish(bvid, error='下载字幕失败')
+            journal.record(bvid, 'subtitle')
+            await writes.put((bvid, video_title, subtitle_data))
+
+        async def write(bvid, video_title, subtitle_data):
+            output_path = await client.run_blocking(convert_to_markdown, subtitle_data, video_title, output_dir)
+            finish(bvid, path=output_path, error=None if output_path else '保存字幕失败')
+
+        workers = [asyncio.create_task(stage(lookups, lookup)) for _ in range(concurrency)]
+        workers += [asyncio.create_task(stage(downloads, download)) for _ in range(concurrency)]
+        workers += [asyncio.create_task(stage(writes, write)) for _ in range(max(1, concurrency // 4))]
+
+        # 输入可能是分页搜索等阻塞的生成器, 在线程中取下一个以免阻塞事件循环
+        done = object()
+        while True:
+            bvid = await client.run_blocking(next, todo, done)
+            if bvid is done:
+                break
+            await lookups.put((bvid,))
+        for queue in (lookups, downloads, writes):
+            await queue.join()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    print_batch_summary(api, tally, journal)
+    return tally.summary()
 
 
 # ==================== 命令行接口 ====================
@@ -322,25 +1038,40 @@ def main():
     
     parser = argparse.ArgumentParser(description='B站视频搜索和字幕获取工具')
     parser.add_argument('command', choices=['search', 'download', 'batch'], help='执行的操作')
-    parser.add_argument('keyword_or_bvid', nargs='+', help='搜索关键词或BV号')
+    parser.add_argument('keyword_or_bvid', nargs='*', help='搜索关键词或BV号')
     parser.add_argument('--output', '-o', default='subtitles', help='输出目录')
     parser.add_argument('--min-play', '-m', type=int, default=50000, help='最小播放量')
-    parser.add_argument('--max-results', '-r', type=int, default=5, help='最大搜索结果数')
+    parser.add_argument('--max-results', '-r', type=int, help='最大搜索结果数(search 默认 5, batch --search 默认不限)')
+    parser.add_argument('--input', '-i', help='batch 从文件逐行读取 BV 号或视频链接, - 表示标准输入')
+    parser.add_argument('--search', '-s', dest='search_keyword', help='batch 分页搜索关键词, 结果边搜边下载')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='batch 使用异步流水线')
+    parser.add_argument('--concurrency', '-c', type=int, default=16, help='异步流水线每阶段的并发数')
+    parser.add_argument('--offline', action='store_true', help='离线模式: 只使用本地缓存, 不发网络请求')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false', help='不使用响应缓存')
+    parser.add_argument('--resume', action='store_true', help='batch 断点续传: 跳过任务日志中已完成的视频')
+    parser.add_argument('--journal', help='任务日志路径(默认 <输出目录>/journal.jsonl)')
+    parser.add_argument('--retries', type=int, help=f'请求失败时的重试次数(默认 {DEFAULT_MAX_RETRIES})')
     
     args = parser.parse_args()
+    streamed = args.command == 'batch' and (args.input or args.search_keyword)
+    if not args.keyword_or_bvid and not streamed:
+        parser.error('需要提供搜索关键词或BV号')
     
     # 加载配置
     config = load_config()
     if not config:
         return
     
-    # 初始化API
-    api = BilibiliAPI(config)
+    # 初始化API; 离线模式下重试没有意义
+    settings = config.get('settings', {})
+    retries = 0 if args.offline else (
+        args.retries if args.retries is not None else settings.get('max_retries', DEFAULT_MAX_RETRIES))
+    api = BilibiliAPI(config, use_cache=args.use_cache, offline=args.offline, retries=retries)
     
     # 执行操作
     if args.command == 'search':
         keyword = ' '.join(args.keyword_or_bvid)
-        videos = search_videos(api, keyword, args.min_play, args.max_results)
+        videos = search_videos(api, keyword, args.min_play, args.max_results or 5)
         
         if videos:
             print(f"\n📺 找到 {len(videos)} 个视频:")
@@ -360,15 +1091,22 @@ def main():
             print("❌ 字幕下载失败")
     
     elif args.command == 'batch':
-        bvid_list = args.keyword_or_bvid
-        results = batch_download_subtitles(api, bvid_list, args.output)
-        
-        # 显示详细结果
-        for result in results:
-            if result['success']:
-                print(f"✅ {result['bvid']}: {result['path']}")
+        # 文件和分页搜索都以生成器流式送入下载流水线
+        if args.input:
+            bvid_list = read_bvid_file(args.input)
+        elif args.search_keyword:
+            print(f"🔍 搜索关键词: {args.search_keyword}")
+            videos = iter_search_videos(api, args.search_keyword, args.min_play)
+            bvid_list = (video['bvid'] for video in islice(videos, args.max_results))
+        else:
+            bvid_list = args.keyword_or_bvid
+        with JobJournal(args.journal or Path(args.output) / 'journal.jsonl') as journal:
+            # 每个视频的结果在完成时输出
+            if args.use_async:
+                asyncio.run(async_batch_download_subtitles(
+                    api, bvid_list, args.output, args.concurrency, journal, args.resume))
             else:
-                print(f"❌ {result['bvid']}: {result.get('error', '失败')}")
+                batch_download_subtitles(api, bvid_list, args.output, journal=journal, resume=args.resume)
 
 
 if __name__ == '__main__':
@@ -1,182 +1,1482 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import warnings
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
+from matplotlib.figure import Figure
 from pathlib import Path
 
-def summarize_csv(file_path):
+DESCRIBE_ROWS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+SKETCH_CHUNKSIZE = 100_000
+Z_95 = 1.959964  # two-sided 95% normal quantile
+DTYPE_SAMPLE_ROWS = 10_000
+# A sampled string column becomes `category` when at most this fraction of
+# its values are distinct.
+CATEGORY_MAX_RATIO = 0.5
+DEFAULT_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'csv-data-summarizer'
+DEFAULT_CACHE_MB = 1024
+CACHE_VERSION = 1
+CACHE_HEAD_BYTES = 1 << 16
+CORR_BLOCK_ROWS = 65_536
+CORR_PRINT_MAX = 10      # print the whole matrix up to this many columns
+CORR_ANNOTATE_MAX = 20   # write r into heatmap cells up to this many columns
+CORR_TOP_PAIRS = 10
+TS_MAX_BUCKETS = 10_000  # distinct timestamps kept before resampling
+TS_PLOT_POINTS = 2_000   # points per plotted series after LTTB
+TS_FREQUENCIES = [  # (label, period alias, approximate width), finest first
+    ('hourly', 'h', pd.Timedelta(hours=1)),
+    ('daily', 'D', pd.Timedelta(days=1)),
+    ('weekly', 'W', pd.Timedelta(weeks=1)),
+    ('monthly', 'M', pd.Timedelta(days=30.44)),
+    ('yearly', 'Y', pd.Timedelta(days=365.25)),
+]
+
+
+def _date_columns(columns):
+    return [c for c in columns if 'date' in c.lower() or 'time' in c.lower()]
+
+
+def _format_bytes(n):
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if n < 1024 or unit == 'GiB':
+            return f"{n:,.0f} {unit}" if unit == 'B' else f"{n:,.1f} {unit}"
+        n /= 1024
+
+
+def _looks_like_dates(values):
+    text = values.astype(str)
+    if not len(text) or pd.to_numeric(text, errors='coerce').notna().all():
+        return False
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        parsed = pd.to_datetime(text, errors='coerce')
+    return parsed.notna().mean() >= 0.95
+
+
+def infer_dtypes(file_path, sample_rows=DTYPE_SAMPLE_ROWS):
+    """Sample the head of a CSV and pick compact read_csv() arguments for it.
+
+    String columns whose sampled values parse as dates go to parse_dates and
+    low-cardinality ones become `category`. Numeric columns are left to
+    _downcast_numeric(), which sees the whole column and so cannot overflow
+    on values the sample missed.
+
+    Returns:
+        tuple: (dtype map, parse_dates list, sampled DataFrame)
     """
-    Comprehensively analyzes a CSV file and generates multiple visualizations.
-    
-    Args:
-        file_path (str): Path to the CSV file
-        
+    sample = pd.read_csv(file_path, nrows=sample_rows)
+    dtype, parse_dates = {}, []
+    date_named = set(_date_columns(sample.columns))
+    for col in sample.columns:
+        values = sample[col].dropna()
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values) or values.empty:
+            continue
+        if _looks_like_dates(values):
+            parse_dates.append(col)
+        elif col not in date_named and values.nunique() <= CATEGORY_MAX_RATIO * len(values):
+            dtype[col] = 'category'
+    return dtype, parse_dates, sample
+
+
+def _downcast_numeric(df):
+    """Shrink numeric columns in place to the smallest dtype that holds them exactly."""
+    for col in df.select_dtypes(include='number').columns:
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+            narrow = series.astype(np.float32)
+            if ((narrow.astype(np.float64) == series) | series.isna()).all():
+                df[col] = narrow
+
+
+def _load_compact(file_path):
+    """Load a CSV with inferred dtypes; return it with its memory before and after."""
+    dtype, parse_dates, sample = infer_dtypes(file_path)
+    with warnings.catch_warnings():
+        # Dates that stop parsing past the sample stay strings here and are
+        # coerced later like any other date column.
+        warnings.simplefilter('ignore')
+        df = pd.read_csv(file_path, dtype=dtype, parse_dates=parse_dates)
+    _downcast_numeric(df)
+    per_row = sample.memory_usage(deep=True, index=False).sum() / max(len(sample), 1)
+    memory = {
+        'bytes': int(df.memory_usage(deep=True, index=False).sum()),
+        'default_bytes': int(per_row * len(df)),
+    }
+    return df, memory
+
+
+def _source_signature(file_path):
+    """Identify a file's contents cheaply: resolved path, size, mtime and a hash of its head."""
+    path = Path(file_path).resolve()
+    st = path.stat()
+    with open(path, 'rb') as f:
+        head = hashlib.sha256(f.read(CACHE_HEAD_BYTES)).hexdigest()
+    return {'path': str(path), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'head_sha256': head}
+
+
+class FrameCache:
+    """Size-bounded cache of parsed CSVs as one .npy file per column.
+
+    Entries are keyed by the file's resolved path, size, mtime and a hash of
+    its first 64 KiB, plus the load mode and pandas version, so an edited
+    file (or a different dtype inference) never hits a stale entry. Numeric
+    and datetime columns are memory-mapped back; string and category columns
+    are stored as integer codes with their categories in JSON. When the
+    cache grows past max_bytes, the least recently used entries go first.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MB << 20):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, file_path, mode):
+        raw = json.dumps([CACHE_VERSION, pd.__version__, *_source_signature(file_path).values(), mode])
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def load(self, file_path, mode):
+        """Return (DataFrame, memory report) for a cached load, or None."""
+        entry = self.directory / self.key(file_path, mode)
+        try:
+            meta = json.loads((entry / 'meta.json').read_text(encoding='utf-8'))
+            columns = {}
+            for i, spec in enumerate(meta['columns']):
+                values = np.load(entry / f'{i}.npy', mmap_mode='r')
+                if spec['kind'] == 'codes':
+                    categories = json.loads((entry / f'{i}.categories.json').read_text(encoding='utf-8'))
+                    values = pd.Categorical.from_codes(values, categories=categories)
+                    if spec['dtype'] != 'category':
+                        values = pd.Series(values).astype(spec['dtype'])
+                columns[spec['name']] = values
+            os.utime(entry / 'meta.json')  # mark as recently used
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pd.DataFrame(columns), meta.get('memory')
+
+    def store(self, file_path, mode, df, memory=None):
+        """Write df as a cache entry; columns of unsupported dtypes skip caching."""
+        key = self.key(file_path, mode)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f'{key}.tmp-{os.getpid()}'
+        tmp.mkdir(exist_ok=True)
+        specs = []
+        try:
+            for i, (name, series) in enumerate(df.items()):
+                dtype = series.dtype
+                if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype):
+                    cat = series.array if isinstance(dtype, pd.CategoricalDtype) else pd.Categorical(series)
+                    if pd.api.types.infer_dtype(cat.categories, skipna=True) not in ('string', 'empty'):
+                        return False
+                    np.save(tmp / f'{i}.npy', np.asarray(cat.codes))
+                    (tmp / f'{i}.categories.json').write_text(json.dumps(cat.categories.tolist()), encoding='utf-8')
+                    specs.append({'name': name, 'kind': 'codes', 'dtype': str(dtype)})
+                elif isinstance(dtype, np.dtype) and dtype.kind in 'biufmM':
+                    np.save(tmp / f'{i}.npy', series.to_numpy())
+                    specs.append({'name': name, 'kind': 'array', 'dtype': str(dtype)})
+                else:
+                    return False
+            meta = {'source': str(Path(file_path).resolve()), 'mode': mode, 'columns': specs, 'memory': memory}
+            (tmp / 'meta.json').write_text(json.dumps(meta), encoding='utf-8')
+            try:
+                os.replace(tmp, self.directory / key)
+            except OSError:
+                return False  # another run stored it first
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self._evict(keep=key)
+        return True
+
+    def _evict(self, keep):
+        entries = []
+        for entry in self.directory.iterdir():
+            meta = entry / 'meta.json'
+            if entry.name != keep and meta.is_file():
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                entries.append((meta.stat().st_mtime, size, entry))
+        keep_size = sum(f.stat().st_size for f in (self.directory / keep).iterdir())
+        total = keep_size + sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+def _pool_map(fn, items, workers):
+    """map() over items, on a thread pool when workers > 1.
+
+    Results always come back in input order, so the report is identical to
+    a serial run no matter how the work was scheduled.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, items))
+
+
+def _comoments(values, shift, dtype=np.float32):
+    """Pairwise-complete co-moment sums of (values - shift), in row blocks.
+
+    Returns float64 k x k matrices (n, sx, sxx, sxy): over the rows where
+    both columns i and j are present, n[i, j] counts them, sx[i, j] sums
+    column i, sxx[i, j] sums its squares and sxy[i, j] sums i * j. Each
+    block is multiplied in `dtype` (centred data keeps float32 accurate)
+    and accumulated in float64. `values` may be an array or a DataFrame.
+    """
+    k = values.shape[1]
+    totals = [np.zeros((k, k)) for _ in range(4)]
+    for start in range(0, len(values), CORR_BLOCK_ROWS):
+        block = np.asarray(values[start:start + CORR_BLOCK_ROWS], dtype=np.float64)
+        present = ~np.isnan(block)
+        shifted = np.where(present, block - shift, 0.0).astype(dtype)
+        present = present.astype(dtype)
+        products = (present.T @ present, shifted.T @ present, (shifted * shifted).T @ present, shifted.T @ shifted)
+        for total, product in zip(totals, products):
+            total += product
+    return totals
+
+
+def _correlation_from_comoments(n, sx, sxx, sxy, columns):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * sxy - sx * sx.T
+        var = n * sxx - sx ** 2
+        corr = cov / np.sqrt(var * var.T)
+    corr[(n == 0) | (var <= 0) | (var.T <= 0)] = np.nan
+    np.fill_diagonal(corr, np.where(np.isnan(np.diag(corr)), np.nan, 1.0))
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+
+def _correlation(df, columns):
+    """Pearson correlation of df[columns], like DataFrame.corr() but blocked in float32."""
+    shift = np.nan_to_num(df[columns].mean().to_numpy(dtype=np.float64))
+    return _correlation_from_comoments(*_comoments(df[columns], shift), columns)
+
+
+def _top_correlations(corr, k=CORR_TOP_PAIRS):
+    """The k most strongly correlated distinct column pairs as (a, b, r)."""
+    values = corr.to_numpy()
+    i, j = np.triu_indices(len(values), 1)
+    r = values[i, j]
+    keep = ~np.isnan(r)
+    i, j, r = i[keep], j[keep], r[keep]
+    order = np.argsort(-np.abs(r), kind='stable')[:k]
+    return [(corr.index[i[o]], corr.columns[j[o]], r[o]) for o in order]
+
+
+def _time_frequency(span, finest='hourly'):
+    """The finest (label, alias) at or above `finest` giving at most TS_MAX_BUCKETS buckets."""
+    labels = [label for label, _, _ in TS_FREQUENCIES]
+    candidates = TS_FREQUENCIES[labels.index(finest):]
+    for label, alias, width in candidates:
+        if span / width <= TS_MAX_BUCKETS:
+            return label, alias
+    return candidates[-1][:2]
+
+
+def _time_buckets(dates):
+    """Factorize a parsed date column once into (codes, bucket starts, label).
+
+    Raw timestamps are kept when there are at most TS_MAX_BUCKETS of them;
+    otherwise they are resampled to the frequency _time_frequency() picks
+    and label names it. NaT gets code -1.
+    """
+    codes, uniques = pd.factorize(dates, sort=True)
+    if len(uniques) <= TS_MAX_BUCKETS:
+        return codes, pd.DatetimeIndex(uniques, name=dates.name), None
+    label, alias = _time_frequency(uniques[-1] - uniques[0])
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # to_period() drops any timezone
+        starts = dates.dt.to_period(alias).dt.start_time
+    codes, uniques = pd.factorize(starts, sort=True)
+    return codes, pd.DatetimeIndex(uniques, name=dates.name), label
+
+
+def _bucket_means(codes, index, values):
+    values = np.asarray(values, dtype=np.float64)
+    ok = (codes >= 0) & ~np.isnan(values)
+    sums = np.bincount(codes[ok], weights=values[ok], minlength=len(index))
+    counts = np.bincount(codes[ok], minlength=len(index))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.Series(sums / counts, index=index)
+
+
+def _lttb(x, y, points):
+    """Indices of `points` samples of (x, y) chosen by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each of the buckets between,
+    the point forming the largest triangle with the previous pick and the
+    next bucket's mean, which preserves peaks and the overall shape.
+    """
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+    every = (n - 2) / (points - 2)
+    selected = [0]
+    for i in range(points - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        following = slice(end, min(int((i + 2) * every) + 1, n)) if i < points - 3 else slice(n - 1, n)
+        mean_x, mean_y = x[following].mean(), y[following].mean()
+        a = selected[-1]
+        area = np.abs((x[a] - mean_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (mean_y - y[a]))
+        selected.append(start + int(np.argmax(area)))
+    selected.append(n - 1)
+    return np.asarray(selected)
+
+
+def _downsample(series, points=TS_PLOT_POINTS):
+    """Reduce a time series to at most `points` points for plotting."""
+    if len(series) <= points:
+        return series
+    series = series.dropna()
+    keep = _lttb(series.index.asi8.astype(np.float64), series.to_numpy(dtype=np.float64), points)
+    return series.iloc[keep]
+
+
+def _frame_stats(df, workers=1):
+    """Compute everything the report and charts need from an in-memory DataFrame.
+
+    The per-column work (missing counts, describe(), value counts and the
+    per-date means) runs over groups of columns on `workers` threads; the
+    results are reassembled in column order.
+    """
+    numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    categorical_cols = [c for c in categorical_cols if 'id' not in c.lower()]
+    date_cols = _date_columns(df.columns) or df.select_dtypes(include='datetime').columns.tolist()
+    date_col = date_cols[0] if date_cols else None
+    dates = None
+    if date_col:
+        # pd.to_datetime keeps a `category` column categorical (and unordered).
+        column = df[date_col]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype(object)
+        dates = pd.to_datetime(column, errors='coerce')
+        date_codes, date_index, time_freq = _time_buckets(dates)
+
+    described, counted = set(numeric_cols), set(categorical_cols[:5])
+    averaged = set(numeric_cols[:3]) if date_col else set()
+
+    def column_group_stats(columns):
+        part = {'missing': {}, 'describe': {}, 'top_values': {}, 'time_series': {}}
+        for col in columns:
+            series = df[col]
+            part['missing'][col] = int(series.isnull().sum())
+            if col in described:
+                part['describe'][col] = series.describe()
+            if col in counted:
+                part['top_values'][col] = series.value_counts().head(10)
+            if col in averaged:
+                part['time_series'][col] = _bucket_means(date_codes, date_index, series)
+        return part
+
+    columns = df.columns.tolist()
+    size = max(1, -(-len(columns) // (4 * workers)))
+    merged = {'missing': {}, 'describe': {}, 'top_values': {}, 'time_series': {}}
+    for part in _pool_map(column_group_stats, [columns[i:i + size] for i in range(0, len(columns), size)], workers):
+        for key, values in part.items():
+            merged[key].update(values)
+
+    stats = {
+        'rows': df.shape[0],
+        'columns': columns,
+        'dtypes': [(col, str(dtype)) for col, dtype in df.dtypes.items()],
+        'missing_by_col': {col: merged['missing'][col] for col in columns},
+        'approximate': False,
+    }
+
+    stats['numeric_cols'] = numeric_cols
+    if numeric_cols:
+        stats['describe'] = pd.DataFrame({col: merged['describe'][col] for col in numeric_cols})
+        stats['corr'] = _correlation(df, numeric_cols) if len(numeric_cols) > 1 else None
+        stats['hist_values'] = {col: df[col].dropna() for col in numeric_cols[:4]}
+
+    stats['categorical_cols'] = categorical_cols
+    stats['top_values'] = {col: merged['top_values'][col] for col in categorical_cols[:5]}
+
+    if date_col:
+        stats['date_col'] = date_col
+        stats['date_min'] = dates.min()
+        stats['date_max'] = dates.max()
+        stats['time_series'] = {col: merged['time_series'][col] for col in numeric_cols[:3]}
+        stats['time_freq'] = time_freq
+
+    return stats
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang & Liberty's KLL).
+
+    Values live in a stack of compactors; an item at level h stands for 2**h
+    inputs. When the sketch outgrows its budget, the lowest over-full level
+    is sorted and every other item (random offset) is promoted a level up.
+    Memory is O(k) regardless of the stream length and the rank error of a
+    quantile is roughly 1.7 / k with high probability.
+    """
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        while sum(map(len, self.levels)) > sum(self._capacity(h) for h in range(len(self.levels))):
+            level = next(h for h in range(len(self.levels)) if len(self.levels[h]) > self._capacity(h))
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            odd = len(items) % 2
+            promoted = items[odd:][self.rng.integers(2)::2]
+            self.levels[level] = items[:odd]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        items = np.concatenate(self.levels)
+        if not len(items):
+            return [np.nan] * len(qs)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        idx = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side='left')
+        return items[np.minimum(idx, len(items) - 1)].tolist()
+
+    @property
+    def rank_error(self):
+        return 1.7 / self.k if self.levels[1:] else 0.0
+
+
+class HeavyHitters:
+    """Mergeable frequent-items summary holding at most `capacity` counters.
+
+    This is the Misra-Gries form of Space-Saving (the two are isomorphic):
+    whenever the table overflows, the (capacity + 1)-th largest count is
+    subtracted from every counter and the non-positive ones are dropped.
+    Reported counts are lower bounds, each short of the true count by at
+    most `error`, which never exceeds n / (capacity + 1). Chunks are folded
+    in via their exact value counts, so the whole update is vectorised.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.n = 0
+        self.error = 0
+        self.counts = pd.Series(dtype='int64')
+
+    def _absorb(self, counts):
+        combined = self.counts.add(counts, fill_value=0)
+        if len(combined) > self.capacity:
+            threshold = combined.nlargest(self.capacity + 1).iloc[-1]
+            combined = combined[combined > threshold] - threshold
+            self.error += int(threshold)
+        self.counts = combined.astype('int64')
+
+    def update(self, values):
+        counts = pd.Series(values).dropna().value_counts(sort=False)
+        self.n += int(counts.sum())
+        self._absorb(counts)
+
+    def merge(self, other):
+        self.n += other.n
+        self.error += other.error
+        self._absorb(other.counts)
+        return self
+
+    def top(self, n=10):
+        return self.counts.sort_values(ascending=False, kind='stable').head(n)
+
+
+class HyperLogLog:
+    """Mergeable distinct-count estimator with 2**precision one-byte registers.
+
+    Values are hashed with pandas' vectorised 64-bit hash; the first
+    `precision` bits pick a register, which keeps the longest run of leading
+    zeros seen in the remaining bits. The relative standard error is
+    1.04 / sqrt(2**precision), about 0.8% at the default of 14 (16 KiB).
+    """
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values):
+        values = pd.Series(values).dropna()
+        if not len(values):
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        rest = hashes << p
+        high, low = rest >> np.uint64(32), rest & np.uint64(0xFFFFFFFF)
+        # Bit length via frexp, split into 32-bit halves so float64 is exact.
+        bit_length = np.where(high > 0, 32 + np.frexp(high.astype(float))[1], np.frexp(low.astype(float))[1])
+        rank = np.minimum(64 - bit_length + 1, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def relative_error(self):
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(2.0 ** -self.registers.astype(float))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)  # linear counting for small cardinalities
+        return raw
+
+
+class StreamingSummary:
+    """Single-pass accumulators over CSV chunks, for files too big to load.
+
+    Memory is bounded by the number of columns, not rows: numeric columns
+    keep count/mean/M2/min/max (merged per chunk with Chan's update),
+    pairwise co-moments for the correlation matrix and a fixed-size
+    reservoir sample for percentiles and histograms. Categorical columns
+    keep at most top_k_capacity value counts each, so counts are exact
+    unless a column has more distinct values than that. The time series is
+    kept as per-day sums and counts.
+
+    With sketch=True, percentiles come from a KLLSketch per numeric column
+    and categorical columns keep a HeavyHitters table of top_k_capacity
+    counters plus a HyperLogLog distinct count, so memory stays constant
+    even for high-cardinality string columns and every error is bounded.
+
+    Column types are fixed by the first chunk; later values in a numeric
+    column that do not parse as numbers count as missing in its statistics.
+    Summaries of disjoint parts of one file (e.g. shards read in parallel)
+    can be combined with merge().
+    """
+
+    def __init__(self, reservoir_size=10_000, top_k_capacity=10_000, seed=0,
+                 sketch=False, kll_k=200, hll_precision=14):
+        self.reservoir_size = reservoir_size
+        self.top_k_capacity = top_k_capacity
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.sketch = sketch
+        self.kll_k = kll_k
+        self.hll_precision = hll_precision
+        self.rows = 0
+        self.columns = None
+
+    def _start(self, chunk):
+        self.columns = chunk.columns.tolist()
+        self.dtypes = {col: str(dtype) for col, dtype in chunk.dtypes.items()}
+        self.nulls = dict.fromkeys(self.columns, 0)
+
+        self.numeric_cols = chunk.select_dtypes(include='number').columns.tolist()
+        k = len(self.numeric_cols)
+        self.count = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+        # Co-moments are accumulated on data shifted by a per-column
+        # reference value, which keeps the sums small and the final
+        # subtraction numerically stable.
+        self.shift = np.nan_to_num(chunk[self.numeric_cols].mean().to_numpy(dtype=float))
+        self.pair_n = np.zeros((k, k))
+        self.pair_sx = np.zeros((k, k))
+        self.pair_sxx = np.zeros((k, k))
+        self.pair_sxy = np.zeros((k, k))
+        self.reservoirs = [np.empty(0) for _ in range(k)]
+        self.seen = np.zeros(k, dtype=np.int64)
+        if self.sketch:
+            self.quantile_sketches = [KLLSketch(self.kll_k, seed=self.seed + j) for j in range(k)]
+
+        categorical_cols = chunk.select_dtypes(include=['object']).columns.tolist()
+        self.categorical_cols = [c for c in categorical_cols if 'id' not in c.lower()]
+        if self.sketch:
+            self.counters = {col: HeavyHitters(self.top_k_capacity) for col in self.categorical_cols[:5]}
+            self.distinct = {col: HyperLogLog(self.hll_precision) for col in self.categorical_cols[:5]}
+        else:
+            self.counters = {col: Counter() for col in self.categorical_cols[:5]}
+        self.truncated = set()
+
+        date_cols = _date_columns(self.columns)
+        self.date_col = date_cols[0] if date_cols else None
+        self.date_min = pd.NaT
+        self.date_max = pd.NaT
+        self.daily_sum = {col: pd.Series(dtype=float) for col in self.numeric_cols[:3]}
+        self.daily_count = {col: pd.Series(dtype=float) for col in self.numeric_cols[:3]}
+
+    def update(self, chunk):
+        """Fold one DataFrame chunk into the running totals."""
+        if self.columns is None:
+            self._start(chunk)
+        self.rows += len(chunk)
+
+        for col, dtype in chunk.dtypes.items():
+            if str(dtype) != self.dtypes.get(col):
+                both_numeric = pd.api.types.is_numeric_dtype(dtype) and self.dtypes[col] in ('int64', 'float64')
+                self.dtypes[col] = 'float64' if both_numeric else 'object'
+        for col, n in chunk.isnull().sum().items():
+            self.nulls[col] = self.nulls.get(col, 0) + int(n)
+
+        if self.numeric_cols:
+            values = chunk[self.numeric_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+            self._update_moments(values)
+            self._update_comoments(values)
+            self._update_reservoirs(values)
+            if self.sketch:
+                for j, quantile_sketch in enumerate(self.quantile_sketches):
+                    quantile_sketch.update(values[:, j])
+
+        for col, counter in self.counters.items():
+            counter.update(chunk[col].dropna())
+            if self.sketch:
+                self.distinct[col].update(chunk[col])
+            else:
+                self._trim_counter(col)
+
+        if self.date_col is not None:
+            dates = pd.to_datetime(chunk[self.date_col], errors='coerce')
+            self.date_min = min(self.date_min, dates.min()) if pd.notna(self.date_min) else dates.min()
+            self.date_max = max(self.date_max, dates.max()) if pd.notna(self.date_max) else dates.max()
+            days = dates.dt.floor('D')
+            for col in self.daily_sum:
+                grouped = pd.to_numeric(chunk[col], errors='coerce').groupby(days).agg(['sum', 'count'])
+                self.daily_sum[col] = self.daily_sum[col].add(grouped['sum'], fill_value=0)
+                self.daily_count[col] = self.daily_count[col].add(grouped['count'], fill_value=0)
+
+    def _trim_counter(self, col):
+        counter = self.counters[col]
+        if len(counter) > 2 * self.top_k_capacity:
+            # Keep the heaviest values; anything dropped here can no
+            # longer make the top 10, so only the tail goes inexact.
+            kept = counter.most_common(self.top_k_capacity)
+            counter.clear()
+            counter.update(dict(kept))
+            self.truncated.add(col)
+
+    def _update_moments(self, values):
+        present = ~np.isnan(values)
+        n_b = present.sum(axis=0).astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_b = np.where(n_b > 0, np.nansum(values, axis=0) / np.maximum(n_b, 1), 0.0)
+            m2_b = np.nansum((values - mean_b) ** 2, axis=0)
+            n = self.count + n_b
+            delta = mean_b - self.mean
+            safe_n = np.maximum(n, 1)
+            self.mean = self.mean + delta * n_b / safe_n
+            self.m2 = self.m2 + m2_b + delta ** 2 * self.count * n_b / safe_n
+        self.count = n
+        if len(values):
+            self.min = np.fmin(self.min, np.nanmin(np.where(present, values, np.inf), axis=0))
+            self.max = np.fmax(self.max, np.nanmax(np.where(present, values, -np.inf), axis=0))
+
+    def _merge_moments(self, other):
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        safe_n = np.maximum(n, 1)
+        self.mean = self.mean + delta * other.count / safe_n
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / safe_n
+        self.count = n
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+
+    def _update_comoments(self, values):
+        n, sx, sxx, sxy = _comoments(values, self.shift)
+        self.pair_n += n
+        self.pair_sx += sx
+        self.pair_sxx += sxx
+        self.pair_sxy += sxy
+
+    def _merge_comoments(self, other):
+        # Re-express the other summary's sums around this one's shift:
+        # (y + d_i)(y + d_j) expands into terms it already tracks.
+        d = other.shift - self.shift
+        n, sx = other.pair_n, other.pair_sx
+        d_row, d_col = d[:, None], d[None, :]
+        self.pair_n += n
+        self.pair_sx += sx + d_row * n
+        self.pair_sxx += other.pair_sxx + 2 * d_row * sx + d_row ** 2 * n
+        self.pair_sxy += other.pair_sxy + d_col * sx + d_row * sx.T + d_row * d_col * n
+
+    def _update_reservoirs(self, values):
+        # Algorithm R, vectorised: once the reservoir is full, the t-th value
+        # seen replaces a random slot with probability size / t.
+        size = self.reservoir_size
+        for j in range(values.shape[1]):
+            column = values[:, j]
+            column = column[~np.isnan(column)]
+            seen_before = self.seen[j]
+            reservoir = self.reservoirs[j]
+            room = size - len(reservoir)
+            rest = column
+            if room > 0:
+                reservoir = np.concatenate([reservoir, column[:room]])
+                rest = column[room:]
+            if len(rest):
+                t = seen_before + (len(column) - len(rest)) + np.arange(1, len(rest) + 1)
+                slots = (self.rng.random(len(rest)) * t).astype(np.int64)
+                keep = slots < size
+                reservoir[slots[keep]] = rest[keep]
+            self.reservoirs[j] = reservoir
+            self.seen[j] = seen_before + len(column)
+
+    def _merge_reservoirs(self, other):
+        # Each slot of the merged sample comes from a side with probability
+        # proportional to how many values that side has seen.
+        for j in range(len(self.reservoirs)):
+            ours, theirs = self.reservoirs[j], other.reservoirs[j]
+            seen = self.seen[j] + other.seen[j]
+            size = min(self.reservoir_size, len(ours) + len(theirs))
+            if seen:
+                take = self.rng.binomial(size, self.seen[j] / seen)
+                take = min(max(take, size - len(theirs)), len(ours))
+                self.reservoirs[j] = np.concatenate([
+                    self.rng.choice(ours, take, replace=False),
+                    self.rng.choice(theirs, size - take, replace=False),
+                ])
+            self.seen[j] = seen
+
+    def merge(self, other):
+        """Fold another summary of the same columns into this one.
+
+        Both must have been built with the same options over chunks that
+        share a header; the result is as if this summary had also read the
+        other's rows (up to sampling and sketch error).
+        """
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self._start(pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in other.dtypes.items()}))
+        if self.columns != other.columns or self.numeric_cols != other.numeric_cols:
+            raise ValueError("can only merge summaries of the same columns")
+
+        self.rows += other.rows
+        for col, dtype in other.dtypes.items():
+            if dtype != self.dtypes[col]:
+                both_numeric = dtype in ('int64', 'float64') and self.dtypes[col] in ('int64', 'float64')
+                self.dtypes[col] = 'float64' if both_numeric else 'object'
+        for col, n in other.nulls.items():
+            self.nulls[col] += n
+
+        if self.numeric_cols:
+            self._merge_moments(other)
+            self._merge_comoments(other)
+            self._merge_reservoirs(other)
+            if self.sketch:
+                for ours, theirs in zip(self.quantile_sketches, other.quantile_sketches):
+                    ours.merge(theirs)
+
+        for col, counter in self.counters.items():
+            if self.sketch:
+                counter.merge(other.counters[col])
+                self.distinct[col].merge(other.distinct[col])
+            else:
+                counter.update(other.counters[col])
+                self._trim_counter(col)
+        self.truncated |= other.truncated
+
+        if self.date_col is not None:
+            for bound, pick in (('date_min', min), ('date_max', max)):
+                values = [v for v in (getattr(self, bound), getattr(other, bound)) if pd.notna(v)]
+                setattr(self, bound, pick(values) if values else pd.NaT)
+            for col in self.daily_sum:
+                self.daily_sum[col] = self.daily_sum[col].add(other.daily_sum[col], fill_value=0)
+                self.daily_count[col] = self.daily_count[col].add(other.daily_count[col], fill_value=0)
+        return self
+
+    def _correlation(self):
+        return _correlation_from_comoments(
+            self.pair_n, self.pair_sx, self.pair_sxx, self.pair_sxy, self.numeric_cols)
+
+    def stats(self):
+        """Return the accumulated statistics in the shape _frame_stats() produces."""
+        stats = {
+            'rows': self.rows,
+            'columns': self.columns,
+            'dtypes': [(col, self.dtypes[col]) for col in self.columns],
+            'missing_by_col': self.nulls,
+            'numeric_cols': self.numeric_cols,
+            'categorical_cols': self.categorical_cols,
+            'approximate': bool(
+                self.sketch or self.truncated
+                or any(self.seen[j] > self.reservoir_size for j in range(len(self.numeric_cols)))
+            ),
+        }
+
+        if self.numeric_cols:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                std = np.sqrt(self.m2 / (self.count - 1))
+            describe = {}
+            for j, col in enumerate(self.numeric_cols):
+                if self.count[j]:
+                    if self.sketch:
+                        q25, q50, q75 = self.quantile_sketches[j].quantiles([0.25, 0.5, 0.75])
+                    else:
+                        q25, q50, q75 = np.percentile(self.reservoirs[j], [25, 50, 75])
+                    describe[col] = [self.count[j], self.mean[j], std[j], self.min[j], q25, q50, q75, self.max[j]]
+                else:
+                    describe[col] = [0.0] + [np.nan] * 7
+            stats['describe'] = pd.DataFrame(describe, index=DESCRIBE_ROWS)
+            stats['corr'] = self._correlation() if len(self.numeric_cols) > 1 else None
+            stats['hist_values'] = {col: self.reservoirs[j] for j, col in enumerate(self.numeric_cols[:4])}
+            if self.sketch:
+                stats['quantile_error'] = max(s.rank_error for s in self.quantile_sketches)
+
+        if self.sketch:
+            stats['top_values'] = {col: counter.top(10) for col, counter in self.counters.items()}
+            stats['top_value_error'] = {col: counter.error for col, counter in self.counters.items()}
+            stats['distinct'] = {col: hll.estimate() for col, hll in self.distinct.items()}
+            stats['distinct_error'] = max((hll.relative_error for hll in self.distinct.values()), default=0.0)
+        else:
+            stats['top_values'] = {
+                col: pd.Series(dict(counter.most_common(10)), dtype='int64')
+                for col, counter in self.counters.items()
+            }
+
+        if self.date_col is not None:
+            stats['date_col'] = self.date_col
+            stats['date_min'] = self.date_min
+            stats['date_max'] = self.date_max
+            sums, counts, time_freq = self.daily_sum, self.daily_count, None
+            days = next(iter(sums.values()), pd.Series(dtype=float)).index
+            if len(days) > TS_MAX_BUCKETS:
+                time_freq, alias = _time_frequency(days.max() - days.min(), finest='daily')
+                starts = days.to_period(alias).start_time
+                sums = {col: s.groupby(starts).sum() for col, s in sums.items()}
+                counts = {col: c.groupby(starts).sum() for col, c in counts.items()}
+            stats['time_series'] = {
+                col: (sums[col] / counts[col].where(counts[col] > 0)).sort_index()
+                for col in sums
+            }
+            stats['time_freq'] = time_freq
+
+        return stats
+
+
+def _sample_rows(file_path, n=None, frac=None, chunksize=SKETCH_CHUNKSIZE, seed=0):
+    """Stream a CSV and keep a uniform random sample of its rows.
+
+    With n, every row gets a random key and the n smallest keys are kept
+    (a bottom-k reservoir, so each chunk is folded in with one argpartition);
+    with frac, each row is kept independently with that probability. Only
+    the sample is ever held in memory.
+
     Returns:
-        str: Formatted comprehensive analysis of the dataset
+        tuple: (sampled DataFrame in file order, total number of rows)
     """
-    df = pd.read_csv(file_path)
+    rng = np.random.default_rng(seed)
+    kept, keys, total = [], np.empty(0), 0
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        chunk.index = pd.RangeIndex(total, total + len(chunk))
+        total += len(chunk)
+        chunk_keys = rng.random(len(chunk))
+        if frac is not None:
+            kept.append(chunk[chunk_keys < frac])
+            continue
+        kept.append(chunk)
+        keys = np.concatenate([keys, chunk_keys])
+        if len(keys) > n:
+            pool = pd.concat(kept)
+            keep = np.sort(np.argpartition(keys, n)[:n])
+            kept, keys = [pool.iloc[keep]], keys[keep]
+    sample = pd.concat(kept) if kept else pd.read_csv(file_path, nrows=0)
+    return sample.sort_index().reset_index(drop=True), total
+
+
+def _proportion_interval(k, n, population):
+    """Estimated share and 95% half-width for k of n sampled rows (normal approximation)."""
+    p = k / n if n else 0.0
+    fpc = (population - n) / (population - 1) if population > 1 else 0.0
+    return p, Z_95 * np.sqrt(p * (1 - p) / max(n, 1) * max(fpc, 0.0))
+
+
+def _sample_intervals(df, stats, population):
+    """95% confidence intervals for the mean and median of each numeric column."""
+    n = len(df)
+    fpc = np.sqrt(max((population - n) / (population - 1), 0.0)) if population > 1 else 0.0
+    intervals = {}
+    for col in stats['numeric_cols']:
+        values = np.sort(df[col].dropna().to_numpy(dtype=np.float64))
+        m = len(values)
+        if m < 2:
+            continue
+        half = Z_95 * values.std(ddof=1) / np.sqrt(m) * fpc
+        # Order-statistic interval: the median lies between these ranks with 95% probability.
+        spread = Z_95 * np.sqrt(m) / 2 * fpc
+        low, high = int(max(np.floor(m / 2 - spread), 0)), int(min(np.ceil(m / 2 + spread), m - 1))
+        intervals[col] = {'mean': (values.mean() - half, values.mean() + half), 'median': (values[low], values[high])}
+    return {'rows': n, 'population': population, 'intervals': intervals}
+
+
+def _streaming_stats(file_path, chunksize, sketch=False):
+    summary = StreamingSummary(top_k_capacity=1000 if sketch else 10_000, sketch=sketch)
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        summary.update(chunk)
+    return summary.stats()
+
+
+def _plot_correlation(corr, path, dpi):
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+    # Cell labels and borders only stay legible on small matrices.
+    small = len(corr) <= CORR_ANNOTATE_MAX
+    sns.heatmap(corr, annot=small, cmap='coolwarm', center=0,
+               square=True, linewidths=1 if small else 0, ax=ax)
+    ax.set_title('Correlation Heatmap')
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+
+
+def _plot_time_series(series_by_col, path, dpi):
+    fig = Figure(figsize=(12, 4 * len(series_by_col)))
+    axes = np.atleast_1d(fig.subplots(len(series_by_col), 1))
+
+    for ax, (num_col, series) in zip(axes, series_by_col.items()):
+        series.plot(ax=ax, label='Average', linewidth=2)
+        ax.set_title(f'{num_col} Over Time')
+        ax.set_xlabel('Date')
+        ax.set_ylabel(num_col)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+
+
+def _plot_distributions(histograms, path, dpi):
+    fig = Figure(figsize=(12, 10))
+    axes = fig.subplots(2, 2).flatten()
+
+    for ax, (col, (counts, edges)) in zip(axes, histograms.items()):
+        # Pre-binned counts drawn as weights give the same bars as hist(values).
+        ax.hist(edges[:-1], bins=edges, weights=counts, edgecolor='black', alpha=0.7)
+        ax.set_title(f'Distribution of {col}')
+        ax.set_xlabel(col)
+        ax.set_ylabel('Frequency')
+        ax.grid(True, alpha=0.3)
+
+    # Hide unused subplots
+    for ax in axes[len(histograms):]:
+        ax.set_visible(False)
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+
+
+def _plot_categories(top_values, path, dpi):
+    fig = Figure(figsize=(14, 10))
+    axes = fig.subplots(2, 2).flatten()
+
+    for ax, (col, value_counts) in zip(axes, top_values.items()):
+        ax.barh(range(len(value_counts)), value_counts.values)
+        ax.set_yticks(range(len(value_counts)))
+        ax.set_yticklabels(value_counts.index)
+        ax.set_title(f'Top Values in {col}')
+        ax.set_xlabel('Count')
+        ax.grid(True, alpha=0.3, axis='x')
+
+    # Hide unused subplots
+    for ax in axes[len(top_values):]:
+        ax.set_visible(False)
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+
+
+def _chart_jobs(stats):
+    """List the (file name, plot function, data) charts that apply to this dataset.
+
+    Each job carries only the data its chart draws (histograms are binned
+    here), so it is cheap to ship to a worker process.
+    """
+    jobs = []
+    numeric_cols = stats['numeric_cols']
+    categorical_cols = stats['categorical_cols']
+
+    if stats.get('corr') is not None:
+        jobs.append(('correlation_heatmap.png', _plot_correlation, stats['corr']))
+    if stats.get('date_col') and numeric_cols:
+        series = {col: _downsample(stats['time_series'][col]) for col in numeric_cols[:3]}
+        jobs.append(('time_series_analysis.png', _plot_time_series, series))
+    if numeric_cols:
+        histograms = {col: np.histogram(stats['hist_values'][col], bins=30) for col in numeric_cols[:4]}
+        jobs.append(('distributions.png', _plot_distributions, histograms))
+    if categorical_cols:
+        top_values = {col: stats['top_values'][col] for col in categorical_cols[:4]}
+        jobs.append(('categorical_distributions.png', _plot_categories, top_values))
+    return jobs
+
+
+_pending_charts = []
+
+
+def _render_charts(stats, dpi=150, workers=None, background=False, output_dir='.'):
+    """Draw the charts that apply to this dataset and return their file names.
+
+    By default the charts render here, one after another. workers > 1
+    renders them concurrently in a process pool of up to one worker per
+    chart. With background=True this returns as soon as the jobs are
+    queued; call wait_for_charts() before relying on the files.
+    """
+    jobs = _chart_jobs(stats)
+    workers = min(len(jobs), workers or 1)
+    if workers <= 1 and not background:
+        for name, plot, data in jobs:
+            plot(data, os.path.join(output_dir, name), dpi)
+        return [name for name, _, _ in jobs]
+
+    def submit(executor):
+        return [executor.submit(plot, data, os.path.join(output_dir, name), dpi) for name, plot, data in jobs]
+
+    if background:
+        # wait_for_charts() joins the pool; leaving it to interpreter exit can
+        # race the pool's management thread against closed descriptors.
+        executor = ProcessPoolExecutor(max_workers=max(workers, 1))
+        _pending_charts.append((executor, submit(executor)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for future in submit(executor):
+                future.result()
+    return [name for name, _, _ in jobs]
+
+
+def wait_for_charts():
+    """Block until charts queued with background=True are written.
+
+    Re-raises the first rendering error, if any.
+    """
+    while _pending_charts:
+        executor, futures = _pending_charts.pop(0)
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            executor.shutdown(wait=True)
+
+
+def _format_report(stats, charts_created):
+    """Lay the statistics out as the text report summarize_csv() returns."""
     summary = []
-    charts_created = []
-    
+    rows = stats['rows']
+    columns = stats['columns']
+
     # Basic info
     summary.append("=" * 60)
     summary.append("📊 DATA OVERVIEW")
     summary.append("=" * 60)
-    summary.append(f"Rows: {df.shape[0]:,} | Columns: {df.shape[1]}")
-    summary.append(f"\nColumns: {', '.join(df.columns.tolist())}")
-    
+    sample = stats.get('sample')
+    if sample:
+        summary.append(f"Rows: {sample['population']:,} | Columns: {len(columns)}")
+        share = sample['rows'] / sample['population'] if sample['population'] else 0
+        summary.append(f"Sampled {sample['rows']:,} rows ({share:.2%}): figures below are estimates "
+                       f"with 95% confidence intervals")
+    else:
+        summary.append(f"Rows: {rows:,} | Columns: {len(columns)}")
+    if stats.get('memory'):
+        memory = stats['memory']
+        saved = 1 - memory['bytes'] / memory['default_bytes'] if memory['default_bytes'] else 0
+        summary.append(f"Memory: {_format_bytes(memory['bytes'])} with inferred dtypes "
+                       f"(~{_format_bytes(memory['default_bytes'])} with pandas defaults, {saved:.0%} saved)")
+    summary.append(f"\nColumns: {', '.join(columns)}")
+
     # Data types
     summary.append(f"\n📋 DATA TYPES:")
-    for col, dtype in df.dtypes.items():
+    for col, dtype in stats['dtypes']:
         summary.append(f"  • {col}: {dtype}")
-    
+
     # Missing data analysis
-    missing = df.isnull().sum().sum()
-    missing_pct = (missing / (df.shape[0] * df.shape[1])) * 100
+    missing = sum(stats['missing_by_col'].values())
+    missing_pct = (missing / (rows * len(columns))) * 100 if rows and columns else 0
     summary.append(f"\n🔍 DATA QUALITY:")
-    if missing:
+    if missing and sample:
+        population = sample['population']
+        summary.append(f"Missing values: ~{missing_pct / 100 * population * len(columns):,.0f} "
+                       f"({missing_pct:.2f}% of total data)")
+        summary.append("Missing by column:")
+        for col in columns:
+            col_missing = stats['missing_by_col'][col]
+            if col_missing > 0:
+                p, half = _proportion_interval(col_missing, rows, population)
+                summary.append(f"  • {col}: ~{p * population:,.0f} ({p:.2%} ± {half:.2%})")
+    elif missing:
         summary.append(f"Missing values: {missing:,} ({missing_pct:.2f}% of total data)")
         summary.append("Missing by column:")
-        for col in df.columns:
-            col_missing = df[col].isnull().sum()
+        for col in columns:
+            col_missing = stats['missing_by_col'][col]
             if col_missing > 0:
-                col_pct = (col_missing / len(df)) * 100
+                col_pct = (col_missing / rows) * 100
                 summary.append(f"  • {col}: {col_missing:,} ({col_pct:.1f}%)")
     else:
         summary.append("✓ No missing values - dataset is complete!")
-    
+
     # Numeric analysis
-    numeric_cols = df.select_dtypes(include='number').columns.tolist()
-    if numeric_cols:
+    if stats['numeric_cols']:
         summary.append(f"\n📈 NUMERICAL ANALYSIS:")
-        summary.append(str(df[numeric_cols].describe()))
-        
+        summary.append(str(stats['describe']))
+        if sample:
+            summary.append(f"(computed on the sample; 95% confidence intervals:)")
+            for col, interval in sample['intervals'].items():
+                (mean_low, mean_high), (median_low, median_high) = interval['mean'], interval['median']
+                summary.append(f"  • {col}: mean {mean_low:.6g} to {mean_high:.6g}, "
+                               f"median {median_low:.6g} to {median_high:.6g}")
+        elif 'quantile_error' in stats:
+            summary.append(f"(sketched: percentiles within ±{stats['quantile_error']:.1%} in rank)")
+        elif stats['approximate']:
+            summary.append("(streamed: percentiles estimated from a sample of each column)")
+
         # Correlations if multiple numeric columns
-        if len(numeric_cols) > 1:
+        if stats['corr'] is not None:
             summary.append(f"\n🔗 CORRELATIONS:")
-            corr_matrix = df[numeric_cols].corr()
-            summary.append(str(corr_matrix))
-            
-            # Create correlation heatmap
-            plt.figure(figsize=(10, 8))
-            sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, 
-                       square=True, linewidths=1)
-            plt.title('Correlation Heatmap')
-            plt.tight_layout()
-            plt.savefig('correlation_heatmap.png', dpi=150)
-            plt.close()
-            charts_created.append('correlation_heatmap.png')
-    
+            if stats.get('corr_file'):
+                pairs = len(stats['corr']) * (len(stats['corr']) - 1) // 2
+                summary.append(f"Strongest of {pairs:,} pairs (full matrix: {stats['corr_file']}):")
+                for a, b, r in _top_correlations(stats['corr']):
+                    summary.append(f"  • {a} ↔ {b}: {r:+.3f}")
+            else:
+                summary.append(str(stats['corr']))
+
     # Categorical analysis
-    categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-    categorical_cols = [c for c in categorical_cols if 'id' not in c.lower()]
-    
-    if categorical_cols:
+    if stats['categorical_cols']:
         summary.append(f"\n📊 CATEGORICAL ANALYSIS:")
-        for col in categorical_cols[:5]:  # Limit to first 5
-            value_counts = df[col].value_counts()
+        for col in stats['categorical_cols'][:5]:  # Limit to first 5
             summary.append(f"\n{col}:")
-            for val, count in value_counts.head(10).items():
-                pct = (count / len(df)) * 100
+            if 'distinct' in stats:
+                summary.append(f"  Distinct values: ~{stats['distinct'][col]:,.0f} (±{stats['distinct_error']:.1%})")
+            for val, count in stats['top_values'][col].items():
+                if sample:
+                    p, half = _proportion_interval(count, rows, sample['population'])
+                    summary.append(f"  • {val}: ~{p * sample['population']:,.0f} ({p:.2%} ± {half:.2%})")
+                    continue
+                pct = (count / rows) * 100
                 summary.append(f"  • {val}: {count:,} ({pct:.1f}%)")
-    
+            if stats.get('top_value_error', {}).get(col):
+                summary.append(f"  (counts may be low by up to {stats['top_value_error'][col]:,})")
+
     # Time series analysis
-    date_cols = [c for c in df.columns if 'date' in c.lower() or 'time' in c.lower()]
-    if date_cols:
+    if stats.get('date_col'):
         summary.append(f"\n📅 TIME SERIES ANALYSIS:")
-        date_col = date_cols[0]
-        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-        
-        date_range = df[date_col].max() - df[date_col].min()
-        summary.append(f"Date range: {df[date_col].min()} to {df[date_col].max()}")
+        date_range = stats['date_max'] - stats['date_min']
+        summary.append(f"Date range: {stats['date_min']} to {stats['date_max']}")
         summary.append(f"Span: {date_range.days} days")
-        
-        # Create time-series plots for numeric columns
-        if numeric_cols:
-            fig, axes = plt.subplots(min(3, len(numeric_cols)), 1, 
-                                    figsize=(12, 4 * min(3, len(numeric_cols))))
-            if len(numeric_cols) == 1:
-                axes = [axes]
-            
-            for idx, num_col in enumerate(numeric_cols[:3]):
-                ax = axes[idx] if len(numeric_cols) > 1 else axes[0]
-                daily_data = df.groupby(date_col)[num_col].agg(['mean', 'sum', 'count'])
-                daily_data['mean'].plot(ax=ax, label='Average', linewidth=2)
-                ax.set_title(f'{num_col} Over Time')
-                ax.set_xlabel('Date')
-                ax.set_ylabel(num_col)
-                ax.legend()
-                ax.grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            plt.savefig('time_series_analysis.png', dpi=150)
-            plt.close()
-            charts_created.append('time_series_analysis.png')
-    
-    # Distribution plots for numeric columns
-    if numeric_cols:
-        n_cols = min(4, len(numeric_cols))
-        fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-        axes = axes.flatten()
-        
-        for idx, col in enumerate(numeric_cols[:4]):
-            axes[idx].hist(df[col].dropna(), bins=30, edgecolor='black', alpha=0.7)
-            axes[idx].set_title(f'Distribution of {col}')
-            axes[idx].set_xlabel(col)
-            axes[idx].set_ylabel('Frequency')
-            axes[idx].grid(True, alpha=0.3)
-        
-        # Hide unused subplots
-        for idx in range(len(numeric_cols[:4]), 4):
-            axes[idx].set_visible(False)
-        
-        plt.tight_layout()
-        plt.savefig('distributions.png', dpi=150)
-        plt.close()
-        charts_created.append('distributions.png')
-    
-    # Categorical distributions
-    if categorical_cols:
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-        axes = axes.flatten()
-        
-        for idx, col in enumerate(categorical_cols[:4]):
-            value_counts = df[col].value_counts().head(10)
-            axes[idx].barh(range(len(value_counts)), value_counts.values)
-            axes[idx].set_yticks(range(len(value_counts)))
-            axes[idx].set_yticklabels(value_counts.index)
-            axes[idx].set_title(f'Top Values in {col}')
-            axes[idx].set_xlabel('Count')
-            axes[idx].grid(True, alpha=0.3, axis='x')
-        
-        # Hide unused subplots
-        for idx in range(len(categorical_cols[:4]), 4):
-            axes[idx].set_visible(False)
-        
-        plt.tight_layout()
-        plt.savefig('categorical_distributions.png', dpi=150)
-        plt.close()
-        charts_created.append('categorical_distributions.png')
-    
+        if stats.get('time_freq'):
+            points = len(next(iter(stats['time_series'].values()), ()))
+            summary.append(f"Trends use {stats['time_freq']} averages ({points:,} points)")
+
     # Summary of visualizations
     if charts_created:
         summary.append(f"\n📊 VISUALIZATIONS CREATED:")
         for chart in charts_created:
             summary.append(f"  ✓ {chart}")
-    
+
     summary.append("\n" + "=" * 60)
     summary.append("✅ COMPREHENSIVE ANALYSIS COMPLETE")
     summary.append("=" * 60)
-    
+
     return "\n".join(summary)
 
 
-if __name__ == "__main__":
-    # Test with sample data
-    import sys
-    if len(sys.argv) > 1:
-        file_path = sys.argv[1]
+def _load_frame(file_path, infer_types=False, cache=None):
+    """Read the whole CSV (through the sidecar cache if given); return (df, memory)."""
+    mode = 'inferred' if infer_types else 'default'
+    cached = cache.load(file_path, mode) if cache else None
+    if cached:
+        return cached
+    if infer_types:
+        df, memory = _load_compact(file_path)
+    else:
+        df, memory = pd.read_csv(file_path), None
+    if cache:
+        cache.store(file_path, mode, df, memory)
+    return df, memory
+
+
+def _collect_stats(file_path, chunksize=None, sketch=False, infer_types=False, workers=1,
+                   cache_dir=None, cache_mb=DEFAULT_CACHE_MB, sample=None, sample_frac=None, seed=0):
+    """Run whichever analysis the options select and return its stats dict."""
+    if sample or sample_frac:
+        df, population = _sample_rows(file_path, sample, sample_frac, chunksize or SKETCH_CHUNKSIZE, seed)
+        stats = _frame_stats(df, workers)
+        stats['approximate'] = True
+        stats['sample'] = _sample_intervals(df, stats, population)
+    elif sketch or chunksize:
+        stats = _streaming_stats(file_path, chunksize or SKETCH_CHUNKSIZE, sketch=sketch)
+    else:
+        cache = FrameCache(cache_dir, cache_mb << 20) if cache_dir else None
+        df, memory = _load_frame(file_path, infer_types, cache)
+        stats = _frame_stats(df, workers)
+        if memory:
+            stats['memory'] = memory
+    return stats
+
+
+def _write_outputs(stats, output_dir, charts=True, dpi=150, chart_workers=None, background=False):
+    """Write the correlation matrix (when too big to print) and charts; return the chart names."""
+    os.makedirs(output_dir, exist_ok=True)
+    if stats.get('corr') is not None and len(stats['corr']) > CORR_PRINT_MAX:
+        stats['corr'].to_csv(os.path.join(output_dir, 'correlation_matrix.csv'))
+        stats['corr_file'] = 'correlation_matrix.csv'
+    return _render_charts(stats, dpi, chart_workers, background, output_dir) if charts else []
+
+
+def summarize_csv(file_path, chunksize=None, sketch=False, infer_types=False,
+                  charts=True, dpi=150, chart_workers=None, background=False, workers=1,
+                  cache_dir=None, cache_mb=DEFAULT_CACHE_MB, sample=None, sample_frac=None, seed=0,
+                  output_dir='.'):
+    """
+    Comprehensively analyzes a CSV file and generates multiple visualizations.
+
+    Args:
+        file_path (str): Path to the CSV file
+        chunksize (int, optional): Stream the file in chunks of this many rows
+            instead of loading it whole. Memory stays bounded regardless of
+            file size; percentiles, histograms and (for very high-cardinality
+            columns) top-value counts become estimates.
+        sketch (bool, optional): Use bounded-error sketches instead of
+            exact sorts and counts: KLL percentiles, heavy-hitter top values
+            and HyperLogLog distinct counts. Implies streaming (in chunks of
+            SKETCH_CHUNKSIZE rows unless chunksize is given).
+        infer_types (bool, optional): Sample the file first and load it with
+            downcast numerics, `category` strings and dates parsed at read
+            time, reporting the memory saved. Applies to in-memory loads.
+        charts (bool, optional): Render the PNG charts (default True).
+        dpi (int, optional): Resolution of the charts; lower is faster.
+        chart_workers (int, optional): Processes to render charts with
+            (default: none, they render in this process). A pool needs the
+            caller's script to be import-safe (an ``if __name__ ==
+            "__main__"`` guard) on platforms that spawn workers.
+        background (bool, optional): Return the summary without waiting for
+            the charts; call wait_for_charts() before using the files.
+        workers (int, optional): Threads for the per-column statistics of an
+            in-memory load; columns are split into groups across them.
+        cache_dir (str, optional): Keep a columnar copy of each parsed file
+            here, so repeat runs on an unchanged file skip CSV parsing.
+        cache_mb (int, optional): Size limit of cache_dir; least recently
+            used entries are evicted beyond it.
+        sample (int, optional): Analyze a uniform random sample of this many
+            rows, drawn while streaming the file, for a quick preview.
+            Statistics are reported as estimates with 95% confidence
+            intervals.
+        sample_frac (float, optional): Like sample, but keep each row with
+            this probability.
+        seed (int, optional): Random seed for sampling.
+        output_dir (str, optional): Where charts and other files are
+            written (default: the current directory).
+
+    Returns:
+        str: Formatted comprehensive analysis of the dataset
+    """
+    stats = _collect_stats(file_path, chunksize, sketch, infer_types, workers,
+                           cache_dir, cache_mb, sample, sample_frac, seed)
+    charts_created = _write_outputs(stats, output_dir, charts, dpi, chart_workers, background)
+    return _format_report(stats, charts_created)
+
+
+def _batch_inputs(patterns):
+    """Expand files, directories (their *.csv) and glob patterns, in order, without duplicates."""
+    files = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            files.extend(sorted(path.glob('*.csv')))
+        elif any(c in pattern for c in '*?['):
+            files.extend(sorted(Path(p) for p in glob.glob(pattern, recursive=True)))
+        else:
+            files.append(path)
+    return list({str(f.resolve()): f for f in files}.values())
+
+
+def _output_names(files):
+    """One output directory name per file: its stem, made unique with a path hash if needed."""
+    stems = Counter(f.stem for f in files)
+    return [
+        f.stem if stems[f.stem] == 1 else f"{f.stem}-{hashlib.sha256(str(f.resolve()).encode()).hexdigest()[:8]}"
+        for f in files
+    ]
+
+
+# Options that only change how fast a report is made, never what it says.
+_SPEED_OPTIONS = {'workers', 'cache_dir', 'cache_mb'}
+
+
+def _batch_fingerprint(options):
+    """Changes whenever the analyzer code or the report options do."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    report_options = {k: v for k, v in options.items() if k not in _SPEED_OPTIONS}
+    digest.update(json.dumps(report_options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def _summarize_into(file_path, output_dir, options, fingerprint, force=False):
+    """Summarize one file into output_dir unless its summary there is still valid.
+
+    Runs in a batch worker process. summary.json is written last, so an
+    interrupted run is never mistaken for a finished one.
+    """
+    output_dir = Path(output_dir)
+    meta_path = output_dir / 'summary.json'
+    result = {'file': str(file_path), 'output': str(output_dir)}
+    try:
+        signature = _source_signature(file_path)
+        meta = json.loads(meta_path.read_text(encoding='utf-8')) if meta_path.is_file() and not force else {}
+        if (meta.get('signature') == signature and meta.get('fingerprint') == fingerprint
+                and (output_dir / 'summary.txt').is_file()):
+            return dict(result, status='cached', **meta['overview'])
+
+        options = dict(options)
+        charts, dpi = options.pop('charts', True), options.pop('dpi', 150)
+        stats = _collect_stats(file_path, **options)
+        charts_created = _write_outputs(stats, output_dir, charts, dpi, chart_workers=1)
+        (output_dir / 'summary.txt').write_text(_format_report(stats, charts_created) + "\n", encoding='utf-8')
+    except Exception as e:
+        # One unreadable file must not take the rest of the batch down with it.
+        return dict(result, status=f'failed: {type(e).__name__}: {e}')
+
+    overview = {
+        'rows': int(stats['sample']['population'] if stats.get('sample') else stats['rows']),
+        'columns': len(stats['columns']),
+        'missing': int(sum(stats['missing_by_col'].values())),
+        'estimated': bool(stats['approximate']),
+    }
+    tmp = meta_path.with_name(meta_path.name + '.tmp')
+    tmp.write_text(json.dumps({'signature': signature, 'fingerprint': fingerprint, 'overview': overview}),
+                   encoding='utf-8')
+    os.replace(tmp, meta_path)
+    return dict(result, status='summarized', **overview)
+
+
+def _write_index(results, output_dir):
+    lines = [
+        "# CSV summaries",
+        "",
+        "| File | Rows | Columns | Missing | Status | Report |",
+        "|---|---:|---:|---:|---|---|",
+    ]
+    for r in results:
+        if r['status'].startswith('failed'):
+            status = ' '.join(r['status'].replace('|', '\\|').split())
+            lines.append(f"| {r['file']} | | | | {status} | |")
+            continue
+        approx = '~' if r['estimated'] else ''
+        report = Path(os.path.relpath(r['output'], output_dir)) / 'summary.txt'
+        lines.append(f"| {r['file']} | {approx}{r['rows']:,} | {r['columns']} | {approx}{r['missing']:,} "
+                     f"| {r['status']} | [summary]({report.as_posix()}) |")
+    path = Path(output_dir) / 'index.md'
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return path
+
+
+def summarize_batch(inputs, output_dir='csv-summaries', jobs=None, force=False, **options):
+    """
+    Summarize many CSV files in a process pool, one output directory each.
+
+    Args:
+        inputs (list): CSV files, directories (all *.csv inside) or glob patterns
+        output_dir (str): Root directory; each file gets output_dir/<stem>/
+            with summary.txt, its charts and summary.json, and the root gets
+            an index.md table linking them all
+        jobs (int, optional): Worker processes (default: CPU count)
+        force (bool, optional): Re-summarize files whose summary is still valid
+        **options: Any summarize_csv() analysis options (chunksize, sketch,
+            infer_types, sample, dpi, charts, ...); changing them, the file
+            or this script invalidates earlier summaries
+
+    Returns:
+        list: One dict per file with its status and overview, in input order
+    """
+    files = _batch_inputs(inputs)
+    targets = [os.path.join(output_dir, name) for name in _output_names(files)]
+    fingerprint = _batch_fingerprint(options)
+    jobs = min(jobs or os.cpu_count() or 1, max(len(files), 1))
+    args = [(str(f), target, options, fingerprint, force) for f, target in zip(files, targets)]
+    if jobs <= 1:
+        results = [_summarize_into(*a) for a in args]
     else:
-        file_path = "resources/sample.csv"
-    
-    print(summarize_csv(file_path))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_summarize_into, *zip(*args)))
+    os.makedirs(output_dir, exist_ok=True)
+    _write_index(results, output_dir)
+    return results
+
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Summarize a CSV file with statistics and charts')
+    parser.add_argument('file_path', nargs='*', default=['resources/sample.csv'],
+                        help='CSV file to analyze; several files, directories or glob patterns run a batch')
+    parser.add_argument('--chunksize', type=int, metavar='ROWS',
+                        help='stream the file in chunks of ROWS rows (for files larger than memory)')
+    parser.add_argument('--sketch', action='store_true',
+                        help='use constant-memory sketches for percentiles, top values and distinct counts')
+    parser.add_argument('--infer-types', action='store_true',
+                        help='sample the file and load it with compact dtypes, reporting the memory saved')
+    sampling = parser.add_mutually_exclusive_group()
+    sampling.add_argument('--sample', type=int, metavar='N',
+                          help='preview: analyze a random sample of N rows with confidence intervals')
+    sampling.add_argument('--sample-frac', type=float, metavar='F',
+                          help='preview: analyze a random fraction F of the rows')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help='threads for the per-column statistics (default: 1)')
+    parser.add_argument('--cache', nargs='?', const=str(DEFAULT_CACHE_DIR), metavar='DIR',
+                        help=f'cache parsed columns for repeat runs (default dir: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_MB,
+                        help=f'size limit of the cache directory in MiB (default: {DEFAULT_CACHE_MB})')
+    parser.add_argument('-o', '--output-dir', metavar='DIR',
+                        help='where to write charts (default: current dir) or batch summaries '
+                             '(default: csv-summaries)')
+    parser.add_argument('-j', '--jobs', type=int, metavar='N',
+                        help='batch: files summarized in parallel (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='batch: re-summarize files even if unchanged')
+    parser.add_argument('--no-charts', dest='charts', action='store_false', help='skip the PNG charts')
+    parser.add_argument('--dpi', type=int, default=150, help='chart resolution (default: 150)')
+    parser.add_argument('--chart-workers', type=int, metavar='N',
+                        help='processes to render charts with (default: CPU count)')
+    args = parser.parse_args()
+
+    options = dict(chunksize=args.chunksize, sketch=args.sketch, infer_types=args.infer_types,
+                   charts=args.charts, dpi=args.dpi, workers=args.workers, cache_dir=args.cache,
+                   cache_mb=args.cache_mb, sample=args.sample, sample_frac=args.sample_frac)
+    single = args.file_path[0]
+    if len(args.file_path) > 1 or Path(single).is_dir() or any(c in single for c in '*?['):
+        output_dir = args.output_dir or 'csv-summaries'
+        for result in summarize_batch(args.file_path, output_dir, jobs=args.jobs, force=args.force, **options):
+            print(f"{result['status']:>10}  {result['file']}")
+        print(f"Index: {os.path.join(output_dir, 'index.md')}")
+    else:
+        # Print the summary as soon as it is ready; the charts finish behind it.
+        print(summarize_csv(single, chart_workers=args.chart_workers or os.cpu_count(), background=True,
+                            output_dir=args.output_dir or '.', **options), flush=True)
+        wait_for_charts()